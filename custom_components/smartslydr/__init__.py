@@ -1,110 +1,54 @@
 # config/custom_components/smartslydr/__init__.py
 
-import asyncio
 import logging
 from datetime import timedelta
 
-import aiohttp
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.const import CONF_SCAN_INTERVAL
-from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import (
     config_validation as cv,
     entity_registry as er,
-    issue_registry as ir,
 )
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_call_later
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api_client import SmartSlydrApiClient, SmartSlydrApiError, SmartSlydrAuthError
+from .api_client import SmartSlydrApiClient
 from .const import (
     CALIBRATED_DURATION_OPTION_PREFIX,
     CONF_BASE_URL,
+    CONF_MOTION_MODE,
     CONF_PASSWORD,
+    CONF_STALE_DEVICE_POLLS,
     CONF_USERNAME,
     DEFAULT_BASE_URL,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    MOVE_DURATION_OPTION_PREFIX,
     PLATFORMS,
     SERVICE_RECALIBRATE_COVER,
 )
-from .helpers import (
-    SmartSlydrCoordinatorData,
-    coerce_petpass_bool,
-    iter_devices_in_rooms,
+from .coordinator import SmartSlydrCoordinator
+from .motion import async_get_motion_scheduler
+from .storage import (
+    SmartSlydrSnapshotStore,
+    async_get_calibration_store,
+    async_get_token_store,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-ISSUE_UPSTREAM_UNEXPECTED = "upstream_unexpected_response"
-ISSUE_UPSTREAM_UNAVAILABLE = "upstream_unavailable"
-_TRANSIENT_ISSUES = (ISSUE_UPSTREAM_UNEXPECTED, ISSUE_UPSTREAM_UNAVAILABLE)
-
-
-def _create_issue(hass: HomeAssistant, key: str) -> None:
-    ir.async_create_issue(
-        hass,
-        DOMAIN,
-        key,
-        # Fixable so the card has a "Submit" button that runs a retry
-        # via repairs.py instead of only the dismiss-forever "Ignore"
-        # button. Submit doesn't mark the issue dismissed-by-version,
-        # so the card reappears if the underlying problem recurs.
-        is_fixable=True,
-        severity=ir.IssueSeverity.WARNING,
-        translation_key=key,
-    )
-
-
-def _clear_transient_issues(hass: HomeAssistant) -> None:
-    for key in _TRANSIENT_ISSUES:
-        ir.async_delete_issue(hass, DOMAIN, key)
-
-
-# Adaptive polling: when a user issues a command, we want to see real
-# state quickly (so optimistic writes get reconciled). Drop the poll
-# interval to FAST_POLL_INTERVAL_S for FAST_POLL_DURATION_S, then revert.
-#
-# 5s/30s was the original (12 requests in 30s, since each poll hits
-# /devices and /operation/get). That tripped 429s on the upstream AWS
-# API Gateway when several covers were polled concurrently. 10s/30s
-# gives the local interpolation enough reconciliation samples while
-# halving the request rate during the fast window.
-FAST_POLL_INTERVAL_S = 10
-FAST_POLL_DURATION_S = 30
-
-
-class SmartSlydrCoordinator(DataUpdateCoordinator):
-    """Coordinator that supports a temporary fast-poll window."""
-
-    def __init__(self, hass: HomeAssistant, *, default_interval: timedelta, **kwargs):
-        super().__init__(hass, **kwargs)
-        self._default_interval = default_interval
-        self._restore_handle = None
-
-    @callback
-    def trigger_fast_poll(self) -> None:
-        """Drop to fast polling for FAST_POLL_DURATION_S, then restore.
-
-        Idempotent: a second call inside the window cancels and reschedules
-        the restore (the window slides) rather than nesting timers.
-        """
-        self.update_interval = timedelta(seconds=FAST_POLL_INTERVAL_S)
-        if self._restore_handle is not None:
-            self._restore_handle()
-        self._restore_handle = async_call_later(
-            self.hass, FAST_POLL_DURATION_S, self._restore_default_interval
-        )
-        self.hass.async_create_task(self.async_request_refresh())
-
-    @callback
-    def _restore_default_interval(self, _now) -> None:
-        self._restore_handle = None
-        self.update_interval = self._default_interval
+# Options the running integration can apply in place. Covers read
+# motion_mode and move_duration_<id> on every move, and the coordinator
+# reads stale_device_polls on every poll, so for those there is nothing
+# to do beyond not reloading.
+_LIVE_OPTIONS = frozenset({
+    CONF_SCAN_INTERVAL,
+    CONF_BASE_URL,
+    CONF_MOTION_MODE,
+    CONF_STALE_DEVICE_POLLS,
+})
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -115,128 +59,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     base_url = entry.options.get(CONF_BASE_URL, DEFAULT_BASE_URL)
     client = SmartSlydrApiClient(username, password, session, base_url=base_url)
 
-    hass.data.setdefault(DOMAIN, {})
+    # Reuse the last token for this account (saved by a previous run or
+    # handed over by the config flow) so startup goes straight to
+    # /devices; persist every new one for the next start.
+    tokens = await async_get_token_store(hass)
+    client.restore_token(tokens.get(username, base_url))
+    client.set_token_listener(
+        lambda state: tokens.async_set(username, client.base_url, state)
+    )
 
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    hass.data.setdefault(DOMAIN, {})
 
-    async def _async_update_data():
-        try:
-            rooms = await client.get_devices()
-        except SmartSlydrAuthError as err:
-            # Triggers HA's reauth flow (a "Repair credentials" card on
-            # the integration page). User re-enters the password without
-            # losing entity history.
-            raise ConfigEntryAuthFailed(str(err)) from err
-        except SmartSlydrApiError as err:
-            # SmartSlydrApiError messages are sanitized at construction
-            # (no upstream payload echo), safe to surface. Also signal a
-            # repair issue so the user sees a clear "this is server-side"
-            # explanation on the integration page.
-            _create_issue(hass, ISSUE_UPSTREAM_UNEXPECTED)
-            raise UpdateFailed(str(err)) from err
-        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
-            # aiohttp.ClientError is the parent of ClientResponseError,
-            # ClientConnectorError, and aiohttp.InvalidURL. OSError covers
-            # raw socket/DNS errors that aren't always wrapped. Any of
-            # these warrants a repair card with the URL-reset fix flow.
-            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
-            _LOGGER.warning(
-                "SmartSlydr backend unreachable (%s): %s",
-                type(err).__name__,
-                err,
-            )
-            raise UpdateFailed("Error fetching devices") from err
-        except Exception as err:
-            # Truly unexpected (likely a Python-side bug). Still surface a
-            # repair card so the user has access to the URL-reset fix
-            # flow if that turns out to be the underlying cause; the full
-            # traceback hits the log so the bug stays diagnosable.
-            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
-            _LOGGER.exception("Unexpected error fetching devices")
-            raise UpdateFailed("Error fetching devices") from err
-
-        # Successful poll - clear any stale repair cards.
-        _clear_transient_issues(hass)
-
-        device_ids = [
-            dev["device_id"]
-            for dev in iter_devices_in_rooms(rooms)
-            if dev.get("device_id")
-        ]
-
-        # /devices.petpass and /operation/get?command=petpass look like
-        # they overlap, but they're different: /devices.petpass is the
-        # *configuration* (the list of allowed-pet slot entries),
-        # while /operation/get returns the *current on/off* state of
-        # the petpass toggle. Both are needed - the switch's is_on
-        # reads this map; allowed_pets reads /devices.petpass.
-        #
-        # On a transient failure (429, network blip), retain the previous
-        # poll's petpass_states - clearing them would flip every petpass
-        # switch to OFF in the UI for one cycle, which is a worse lie
-        # than showing slightly stale data.
-        prev = coordinator.data
-        prev_petpass = prev.petpass_states if prev is not None else {}
-        petpass_states: dict[str, bool] = dict(prev_petpass)
-        if device_ids:
-            commands = [{"device_id": did, "command": "petpass"} for did in device_ids]
-            try:
-                statuses = await client.get_status(commands)
-            except Exception as err:
-                _LOGGER.warning(
-                    "Failed to fetch petpass states (keeping last known): %s",
-                    err,
-                )
-            else:
-                # Success: replace with fresh values rather than merging,
-                # so a removed device drops out cleanly.
-                petpass_states = {}
-                for st in statuses or []:
-                    did = st.get("device_id")
-                    if did is None or "petpass" not in st:
-                        continue
-                    raw = st.get("petpass")
-                    parsed = coerce_petpass_bool(raw)
-                    if parsed is None:
-                        # Unrecognized shape - log once at warning and
-                        # keep the previous value if any.
-                        _LOGGER.warning(
-                            "Unrecognized petpass value for %s: %r (type %s)",
-                            did,
-                            raw,
-                            type(raw).__name__,
-                        )
-                        if did in prev_petpass:
-                            petpass_states[did] = prev_petpass[did]
-                        continue
-                    petpass_states[did] = parsed
-
-        return SmartSlydrCoordinatorData(rooms=rooms, petpass_states=petpass_states)
+    calibration = await async_get_calibration_store(hass)
+    _async_migrate_calibration_options(hass, entry, calibration)
 
+    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     default_interval = timedelta(seconds=scan_interval)
     coordinator = SmartSlydrCoordinator(
         hass,
+        client,
         logger=_LOGGER,
         name=DOMAIN,
-        update_method=_async_update_data,
-        update_interval=default_interval,
         config_entry=entry,
         default_interval=default_interval,
+        snapshot_store=SmartSlydrSnapshotStore(hass, entry.entry_id),
     )
 
-    # Raises ConfigEntryNotReady on failure so HA retries with backoff
-    # instead of marking the entry permanently failed.
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_snapshot():
+        # Entities come up from the last-known snapshot (flagged as
+        # assumed state) and the live poll runs in the background, so
+        # boot doesn't wait on a cold backend - or fail when it's down.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        # First run: nothing to show until a poll succeeds. Raises
+        # ConfigEntryNotReady on failure so HA retries with backoff
+        # instead of marking the entry permanently failed.
+        await coordinator.async_config_entry_first_refresh()
+
+    # Renew the token ahead of expiry from here on, so commands never
+    # wait on /token. Started only once setup can no longer fail, so a
+    # ConfigEntryNotReady retry doesn't leave a timer behind.
+    client.enable_background_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
         "coordinator": coordinator,
+        "calibration": calibration,
+        # What the running objects were built from; the update listener
+        # diffs against it to decide between applying live and reloading.
+        "applied": (dict(entry.data), dict(entry.options)),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Reload when the user saves the options form so changes to
-    # base_url, scan_interval, etc. take effect immediately. async_on_unload
+    # Apply option changes when the user saves the form. async_on_unload
     # ensures the listener is removed during reload so we don't accumulate
     # one per setup cycle.
     entry.async_on_unload(entry.add_update_listener(_async_options_updated))
@@ -246,9 +124,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+def _is_live_option(key: str) -> bool:
+    return key in _LIVE_OPTIONS or key.startswith(MOVE_DURATION_OPTION_PREFIX)
+
+
 async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload the entry so the running client picks up new options."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options to the running client and coordinator.
+
+    A reload tears down every entity, drops the auth token and cancels
+    in-flight animations, so it's reserved for changes the running
+    objects can't absorb: credentials (entry data) and option keys
+    outside _LIVE_OPTIONS.
+    """
+    bucket = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if bucket is None:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    old_data, old_options = bucket["applied"]
+    new_options = dict(entry.options)
+    changed = {
+        key
+        for key in old_options.keys() | new_options.keys()
+        if old_options.get(key) != new_options.get(key)
+    }
+    if dict(entry.data) != old_data or not all(map(_is_live_option, changed)):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    bucket["applied"] = (old_data, new_options)
+
+    coordinator: SmartSlydrCoordinator = bucket["coordinator"]
+    if CONF_SCAN_INTERVAL in changed:
+        coordinator.async_set_update_interval(
+            timedelta(
+                seconds=new_options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            )
+        )
+    if CONF_BASE_URL in changed:
+        bucket["client"].base_url = new_options.get(CONF_BASE_URL, DEFAULT_BASE_URL)
+        # Poll the new endpoint now so a fix (or a typo) shows up
+        # immediately rather than at the next scheduled poll.
+        await coordinator.async_request_refresh()
+
+
+def _async_migrate_calibration_options(
+    hass: HomeAssistant, entry: ConfigEntry, calibration
+) -> None:
+    """Move calibrated durations from entry options into the calibration store.
+
+    Runs before the update listener is registered, so dropping the keys
+    from options doesn't trigger a reload.
+    """
+    prefix = CALIBRATED_DURATION_OPTION_PREFIX
+    moved = {k: v for k, v in entry.options.items() if k.startswith(prefix)}
+    if not moved:
+        return
+    for key, value in moved.items():
+        device_id = key[len(prefix):]
+        if calibration.duration(device_id) is not None:
+            continue
+        try:
+            calibration.async_set_duration(device_id, float(value))
+        except (TypeError, ValueError):
+            continue
+    hass.config_entries.async_update_entry(
+        entry,
+        options={k: v for k, v in entry.options.items() if k not in moved},
+    )
 
 
 _RECALIBRATE_SCHEMA = vol.Schema({
@@ -263,6 +204,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
 
     async def _handle_recalibrate(call: ServiceCall) -> None:
         ent_reg = er.async_get(hass)
+        calibration = await async_get_calibration_store(hass)
         for entity_id in call.data["entity_id"]:
             entity = ent_reg.async_get(entity_id)
             if entity is None or entity.domain != "cover":
@@ -270,14 +212,12 @@ def _async_register_services(hass: HomeAssistant) -> None:
             if not entity.unique_id.endswith("_cover"):
                 continue
             device_id = entity.unique_id[: -len("_cover")]
-            target_entry = hass.config_entries.async_get_entry(entity.config_entry_id)
-            if target_entry is None:
-                continue
-            key = f"{CALIBRATED_DURATION_OPTION_PREFIX}{device_id}"
-            if key not in target_entry.options:
+            # Forget learned timing too, or the model would keep
+            # overriding the cleared calibration. Neither touches the
+            # entry options, so nothing reloads.
+            async_get_motion_scheduler(hass).model(device_id).reset()
+            if not calibration.async_clear(device_id):
                 continue
-            new_options = {k: v for k, v in target_entry.options.items() if k != key}
-            hass.config_entries.async_update_entry(target_entry, options=new_options)
             _LOGGER.info(
                 "Cleared calibrated move duration for %s (%s)",
                 entity_id,
@@ -297,13 +237,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         bucket = hass.data[DOMAIN].pop(entry.entry_id, None)
         coordinator = bucket.get("coordinator") if bucket else None
-        # Cancel any in-flight fast-poll restore so we don't leak the timer.
-        if isinstance(coordinator, SmartSlydrCoordinator) and coordinator._restore_handle:
-            coordinator._restore_handle()
-            coordinator._restore_handle = None
+        client = bucket.get("client") if bucket else None
+        if isinstance(client, SmartSlydrApiClient):
+            client.shutdown()
+        # Cancel any pending verification reads so we don't leak the timer.
+        if isinstance(coordinator, SmartSlydrCoordinator):
+            coordinator.async_cancel_verification()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted snapshot and cached tokens along with the entry."""
+    await SmartSlydrSnapshotStore(hass, entry.entry_id).async_remove()
+    (await async_get_token_store(hass)).async_remove_account(entry.data[CONF_USERNAME])
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate a config entry to the current schema version."""
     _LOGGER.debug("Migrating SmartSlydr entry %s from v%s", entry.entry_id, entry.version)
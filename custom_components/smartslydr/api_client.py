@@ -1,8 +1,15 @@
 # config/custom_components/smartslydr/api_client.py
 
 import asyncio
+import heapq
+import itertools
+import json
 import logging
+import random
+from collections import deque
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 
 import aiohttp
 
@@ -15,6 +22,75 @@ _LOGGER = logging.getLogger(__name__)
 # reach the server.
 TOKEN_LIFETIME = timedelta(minutes=29)
 
+# Same margin, applied to an ``expires_in`` the server reports itself.
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=1)
+
+# The background refresher renews this long before expiry, so a request
+# never finds the token stale and has to wait on /token (or /auth).
+TOKEN_REFRESH_AHEAD = timedelta(minutes=5)
+
+# After a failed background renewal, try again this often (seconds)
+# while the current token is still valid.
+TOKEN_REFRESH_RETRY_S = 60
+
+# How long set_command waits for other commands to join its /operation
+# call (seconds). A scene or group fans out to every entity within a few
+# milliseconds; this is long enough to catch all of them and short enough
+# not to be felt on a single button press.
+COMMAND_BATCH_WINDOW_S = 0.05
+
+# Client-side request budget for /devices, /operation/get and /operation:
+# a token bucket refilling RATE_LIMIT_PER_S requests per second, holding
+# up to RATE_LIMIT_BURST. The upstream API Gateway answers bursts with
+# 429; spacing requests out here keeps a poll from failing on one.
+RATE_LIMIT_PER_S = 1.0
+RATE_LIMIT_BURST = 5
+
+# Who goes first when the budget is short: a user's command, then a
+# targeted status read (verification after a command), then the regular
+# poll. Polls also leave POLL_RESERVE tokens in the bucket, so a command
+# issued right after a poll burst doesn't have to wait for a refill.
+PRIORITY_COMMAND = 0
+PRIORITY_STATUS = 1
+PRIORITY_POLL = 2
+POLL_RESERVE = 1
+
+# How long the bucket pauses after a 429 without a usable Retry-After.
+RATE_LIMIT_DEFAULT_PAUSE_S = 5.0
+
+# A read that gets a 429 is retried once the pause is over, unless the
+# server asked for longer than this; then it fails and the next poll
+# tries again. Nothing waits out a longer pause: every request fails
+# fast with SmartSlydrRateLimitedError until it's down to this.
+RATE_LIMIT_MAX_WAIT_S = 10.0
+
+# Read retries: up to RETRY_ATTEMPTS after the first try, spaced by
+# decorrelated jitter (each delay drawn between RETRY_BASE_DELAY_S and
+# three times the previous one, capped at RETRY_MAX_DELAY_S) so callers
+# that failed together don't all come back at the same instant.
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY_S = 0.5
+RETRY_MAX_DELAY_S = 8.0
+
+# Client-wide retry budget: over the last RETRY_BUDGET_WINDOW_S, retries
+# may be at most RETRY_BUDGET_RATIO of calls, or RETRY_BUDGET_MIN,
+# whichever is more. A blip costs a retry or two; an outage doesn't
+# multiply every poll by RETRY_ATTEMPTS.
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MIN = 3
+RETRY_BUDGET_WINDOW_S = 60.0
+
+# Circuit breaker: after CIRCUIT_FAILURE_THRESHOLD consecutive requests
+# fail the way an unreachable backend fails (no connection, timeout,
+# 5xx), requests fail fast for CIRCUIT_OPEN_S instead of each waiting
+# out its own timeouts and retries. Then a single probe request is let
+# through ("half-open"): success closes the circuit, failure reopens it.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_S = 60.0
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
 # Keys whose values we replace with "***" before logging a response body.
 # Users routinely paste debug logs into bug reports; raw bearer tokens must
 # not leak that way.
@@ -29,6 +105,309 @@ def _redact(body):
     return body
 
 
+def _retry_after(headers) -> float:
+    """Seconds to back off per a Retry-After header (delta or HTTP date)."""
+    value = headers.get("Retry-After") if headers else None
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            when = None
+        if when is not None:
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    return RATE_LIMIT_DEFAULT_PAUSE_S
+
+
+async def _retry_sleep(delay: float) -> None:
+    """Wait out a retry back-off. Tests replace this, not asyncio.sleep."""
+    await asyncio.sleep(delay)
+
+
+class _TokenBucket:
+    """Request budget shared by every data-endpoint call of one client.
+
+    Waiters are served by priority (PRIORITY_*), then in arrival order;
+    a more urgent arrival goes ahead of anyone already waiting. ``pause``
+    empties the bucket and holds it shut until the server's Retry-After
+    has passed. While more than RATE_LIMIT_MAX_WAIT_S of that is left,
+    ``acquire`` raises SmartSlydrRateLimitedError instead of waiting, so
+    a user command fails in seconds rather than hanging for as long as
+    the server asked.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._paused_until = 0.0
+        # Heap of [priority, seq] entries, one per waiting acquire().
+        self._queue: list[list[int]] = []
+        self._seq = itertools.count()
+        # Resolved (and replaced) whenever the queue or budget changes.
+        self._changed: asyncio.Future | None = None
+        # Requests that had to wait for budget, and 429s received.
+        self.throttled = 0
+        self.rate_limited = 0
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None and now > self._updated:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = max(now, self._updated or now)
+
+    def _notify(self) -> None:
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(None)
+        self._changed = None
+
+    async def _wait_changed(self, timeout: float | None) -> None:
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        await asyncio.wait({self._changed}, timeout=timeout)
+
+    def pending(self, priority: int) -> bool:
+        """Whether anyone at ``priority`` or more urgent is waiting."""
+        return any(entry[0] <= priority for entry in self._queue)
+
+    async def acquire(self, priority: int = PRIORITY_STATUS) -> None:
+        loop = asyncio.get_running_loop()
+        entry = [priority, next(self._seq)]
+        heapq.heappush(self._queue, entry)
+        # Wake a head that's sleeping on a refill, in case we outrank it.
+        self._notify()
+        need = 1 + (POLL_RESERVE if priority >= PRIORITY_POLL else 0)
+        # A bucket too small for the reserve would never serve a poll.
+        need = max(1, min(need, self.burst))
+        waited = False
+        try:
+            while True:
+                if self.paused_for() > RATE_LIMIT_MAX_WAIT_S:
+                    raise SmartSlydrRateLimitedError(
+                        "SmartSlydr rate limit: requests paused for "
+                        f"{self.paused_for():.0f}s"
+                    )
+                timeout = None
+                if self._queue[0] is entry:
+                    now = loop.time()
+                    self._refill(now)
+                    timeout = self._paused_until - now
+                    if timeout <= 0:
+                        if self._tokens >= need:
+                            self._tokens -= 1
+                            if waited:
+                                self.throttled += 1
+                            return
+                        timeout = (need - self._tokens) / self.rate
+                waited = True
+                await self._wait_changed(timeout)
+        finally:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._notify()
+
+    def pause(self, seconds: float) -> None:
+        now = asyncio.get_running_loop().time()
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, now + seconds)
+        # One request may go out the moment the pause is over; refill
+        # resumes from there.
+        self._tokens = 1.0
+        self._updated = self._paused_until
+        # Waiters re-check: a pause past the cap fails them now.
+        self._notify()
+
+    def paused_for(self) -> float:
+        return max(self._paused_until - asyncio.get_running_loop().time(), 0.0)
+
+    def as_dict(self) -> dict:
+        self._refill(asyncio.get_running_loop().time())
+        return {
+            "rate_per_s": self.rate,
+            "burst": self.burst,
+            "available": round(self._tokens, 2),
+            "paused_for": round(self.paused_for(), 2),
+            "waiting": len(self._queue),
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class _RetryBudget:
+    """Sliding-window cap on retries relative to calls."""
+
+    def __init__(self, ratio: float, minimum: int, window: float) -> None:
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._calls: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        for times in (self._calls, self._retries):
+            while times and now - times[0] > self.window:
+                times.popleft()
+
+    def _allowed(self) -> float:
+        return max(self.minimum, self.ratio * len(self._calls))
+
+    def note_call(self) -> None:
+        now = asyncio.get_running_loop().time()
+        self._trim(now)
+        self._calls.append(now)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it's used up."""
+        now = asyncio.get_running_loop().time()
+        self._trim(now)
+        if len(self._retries) >= self._allowed():
+            return False
+        self._retries.append(now)
+        return True
+
+    def as_dict(self) -> dict:
+        self._trim(asyncio.get_running_loop().time())
+        return {
+            "window_s": self.window,
+            "calls": len(self._calls),
+            "retries": len(self._retries),
+            "allowed": self._allowed(),
+        }
+
+
+def _is_outage(err: BaseException) -> bool:
+    """Whether ``err`` looks like the backend being down, not rejecting us."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500
+    return isinstance(err, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class _CircuitBreaker:
+    """Closed / open / half-open gate in front of every API request."""
+
+    def __init__(self, threshold: int, open_for: float) -> None:
+        self.threshold = threshold
+        self.open_for = open_for
+        self.state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # True while the half-open probe is in flight.
+        self._probing = False
+        # Times the circuit opened, and requests refused while it was.
+        self.opened = 0
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """Let a request through, or raise SmartSlydrCircuitOpenError."""
+        if self.state == CIRCUIT_CLOSED:
+            return
+        if (
+            self.state == CIRCUIT_OPEN
+            and asyncio.get_running_loop().time() - self._opened_at >= self.open_for
+        ):
+            self.state = CIRCUIT_HALF_OPEN
+        if self.state == CIRCUIT_HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise SmartSlydrCircuitOpenError(
+            "SmartSlydr API unreachable; not retrying until "
+            f"{self.retry_in():.0f}s from now"
+        )
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("SmartSlydr API reachable again; resuming requests")
+            self.state = CIRCUIT_CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == CIRCUIT_HALF_OPEN or (
+            self.state == CIRCUIT_CLOSED and self._failures >= self.threshold
+        ):
+            if self.state == CIRCUIT_CLOSED:
+                _LOGGER.warning(
+                    "SmartSlydr API unreachable after %d failed requests; "
+                    "pausing requests for %.0fs",
+                    self._failures,
+                    self.open_for,
+                )
+            self.state = CIRCUIT_OPEN
+            self._opened_at = asyncio.get_running_loop().time()
+            self.opened += 1
+
+    def release(self) -> None:
+        """The probe ended without telling us anything (cancelled, or never sent)."""
+        self._probing = False
+
+    def request_probe(self) -> None:
+        """Skip the rest of the open period; the next request probes."""
+        if self.state == CIRCUIT_OPEN:
+            self.state = CIRCUIT_HALF_OPEN
+
+    def retry_in(self) -> float:
+        if self.state != CIRCUIT_OPEN:
+            return 0.0
+        elapsed = asyncio.get_running_loop().time() - self._opened_at
+        return max(self.open_for - elapsed, 0.0)
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in(), 1),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+def command_outcome_unknown(err: BaseException) -> bool:
+    """Whether a failed set_command may still have reached the device.
+
+    True for timeouts, dropped connections, 5xx and upstream Lambda
+    errors - the request may have been applied before the failure.
+    False when it demonstrably wasn't: no connection was made, or the
+    request was rejected (4xx, auth).
+    """
+    if isinstance(
+        err,
+        (SmartSlydrAuthError, SmartSlydrCircuitOpenError, SmartSlydrRateLimitedError),
+    ):
+        return False
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500
+    if isinstance(err, aiohttp.ClientConnectorError):
+        return False
+    return isinstance(
+        err, (asyncio.TimeoutError, aiohttp.ClientConnectionError, SmartSlydrApiError)
+    )
+
+
+class _CommandBatch:
+    """setcommands waiting to go out together in one /operation call."""
+
+    __slots__ = ("entries", "waiters", "device_ids", "flush", "task")
+
+    def __init__(self) -> None:
+        self.entries: list[dict] = []
+        # One (future, device_ids) per set_command caller.
+        self.waiters: list[tuple[asyncio.Future, set]] = []
+        self.device_ids: set = set()
+        # Set to send before the window is up.
+        self.flush = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
 def _raise_if_upstream_error(label: str, data) -> None:
     """Raise SmartSlydrApiError if the body looks like an upstream Lambda error.
 
@@ -53,6 +432,8 @@ class SmartSlydrApiClient:
         password: str,
         session: aiohttp.ClientSession,
         base_url: str = DEFAULT_BASE_URL,
+        rate_limit: float = RATE_LIMIT_PER_S,
+        rate_burst: int = RATE_LIMIT_BURST,
     ):
         self._username = username
         self._password = password
@@ -65,6 +446,189 @@ class SmartSlydrApiClient:
         # poll firing while a user-initiated cover command is in flight).
         # Without it, both paths can trigger /token at the same time.
         self._token_lock = asyncio.Lock()
+        # Called with token_state() whenever a new token is obtained, so
+        # the owner can persist it (see storage.SmartSlydrTokenStore).
+        self._token_listener: Callable[[dict], None] | None = None
+        # Background renewal (enable_background_refresh). Off by default
+        # so short-lived clients, like the config flow's, don't leave a
+        # timer behind.
+        self._background_refresh = False
+        self._refresh_handle: asyncio.TimerHandle | None = None
+        self._refresh_task: asyncio.Task | None = None
+        # Single-flight reads: (label, base_url, payload) -> the task
+        # every concurrent identical caller awaits (see _single_flight).
+        self._inflight: dict[tuple[str, str, str], asyncio.Task] = {}
+        self._read_stats = {"upstream": 0, "coalesced": 0}
+        # set_command batching: the batch still accepting commands, and
+        # the task of the newest batch, whatever its state. A batch never
+        # posts before its predecessor, in or out of its window.
+        self._command_batch: _CommandBatch | None = None
+        self._command_tail: asyncio.Task | None = None
+        self._command_stats = {"calls": 0, "requests": 0}
+        self._bucket = _TokenBucket(rate_limit, rate_burst)
+        self._breaker = _CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_OPEN_S)
+        self._retry_budget = _RetryBudget(
+            RETRY_BUDGET_RATIO, RETRY_BUDGET_MIN, RETRY_BUDGET_WINDOW_S
+        )
+        # label -> retry counters (see _request_with_retry).
+        self._retry_stats: dict[str, dict[str, int]] = {}
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        """Point the client at a new endpoint without recreating it.
+
+        Tokens are only good against the deployment that issued them, so
+        a real change drops them; the next call authenticates afresh.
+        """
+        value = value.rstrip("/")
+        if value == self._base_url:
+            return
+        self._base_url = value
+        self._access_token = None
+        self._refresh_token_value = None
+        self._token_expires = None
+        self._schedule_token_refresh()
+
+    def token_state(self) -> dict | None:
+        """Return the current tokens as a JSON-safe dict, or None if unauthenticated."""
+        if not self._access_token or self._token_expires is None:
+            return None
+        return {
+            "access_token": self._access_token,
+            "refresh_token": self._refresh_token_value,
+            "expires": self._token_expires.isoformat(),
+        }
+
+    def restore_token(self, state: dict | None) -> bool:
+        """Adopt tokens saved from ``token_state()``, skipping /auth.
+
+        An expired access token is still adopted along with its refresh
+        token: _ensure_token then renews via /token, which is cheaper
+        than a full /auth. Returns False if ``state`` is unusable.
+        """
+        if not isinstance(state, dict) or not state.get("access_token"):
+            return False
+        try:
+            expires = datetime.fromisoformat(state["expires"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if expires.tzinfo is None:
+            expires = expires.replace(tzinfo=timezone.utc)
+        self._access_token = state["access_token"]
+        self._refresh_token_value = state.get("refresh_token")
+        self._token_expires = expires
+        self._schedule_token_refresh()
+        return True
+
+    def set_token_listener(self, listener: Callable[[dict], None] | None) -> None:
+        self._token_listener = listener
+
+    def _token_updated(self) -> None:
+        self._schedule_token_refresh()
+        if self._token_listener is not None:
+            self._token_listener(self.token_state())
+
+    def _token_valid(self) -> bool:
+        return (
+            self._access_token is not None
+            and self._token_expires is not None
+            and datetime.now(timezone.utc) < self._token_expires
+        )
+
+    @staticmethod
+    def _expiry_from(body) -> datetime:
+        """Token expiry from the server's ``expires_in`` if sent, else TOKEN_LIFETIME."""
+        lifetime = TOKEN_LIFETIME
+        expires_in = body.get("expires_in") if isinstance(body, dict) else None
+        if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool):
+            lifetime = max(
+                timedelta(seconds=expires_in) - TOKEN_EXPIRY_MARGIN, timedelta(0)
+            )
+        return datetime.now(timezone.utc) + lifetime
+
+    def enable_background_refresh(self) -> None:
+        """Renew the token ahead of expiry in the background from now on.
+
+        Must be called from the event loop; stop it with shutdown().
+        """
+        self._background_refresh = True
+        self._schedule_token_refresh()
+
+    def shutdown(self) -> None:
+        """Stop background token renewal and abandon shared in-flight reads."""
+        self._background_refresh = False
+        self._schedule_token_refresh()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+        if self._command_batch is not None:
+            # Still inside its window: let it go out now rather than
+            # dropping commands the user already pressed.
+            self._command_batch.flush.set()
+            self._command_batch = None
+
+    def diagnostics(self) -> dict:
+        """Return request counters for the diagnostics download."""
+        return {
+            "reads": dict(self._read_stats),
+            "commands": dict(self._command_stats),
+            "rate_limit": self._bucket.as_dict(),
+            "circuit": self._breaker.as_dict(),
+            "retry_budget": self._retry_budget.as_dict(),
+            "retries": {label: dict(stats) for label, stats in self._retry_stats.items()},
+        }
+
+    @property
+    def circuit_state(self) -> str:
+        """CIRCUIT_CLOSED, CIRCUIT_OPEN or CIRCUIT_HALF_OPEN."""
+        return self._breaker.state
+
+    def request_probe(self) -> None:
+        """End an open circuit's wait early; the next request is its probe.
+
+        For a user-initiated retry (the repair flow): one request tests
+        the backend instead of every caller piling in at once.
+        """
+        self._breaker.request_probe()
+
+    def _schedule_token_refresh(self, delay: float | None = None) -> None:
+        if self._refresh_handle is not None:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+        if not self._background_refresh or self._token_expires is None:
+            return
+        if delay is None:
+            delay = (
+                self._token_expires - TOKEN_REFRESH_AHEAD - datetime.now(timezone.utc)
+            ).total_seconds()
+        self._refresh_handle = asyncio.get_running_loop().call_later(
+            max(delay, 0.0), self._start_token_refresh
+        )
+
+    def _start_token_refresh(self) -> None:
+        self._refresh_handle = None
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(
+                self._async_background_refresh()
+            )
+
+    async def _async_background_refresh(self) -> None:
+        try:
+            async with self._token_lock:
+                await self._renew_token()
+        except Exception as err:  # noqa: BLE001 - the on-demand path retries
+            _LOGGER.debug(
+                "Background token renewal failed (%s); will retry", err
+            )
+            if self._token_valid():
+                self._schedule_token_refresh(TOKEN_REFRESH_RETRY_S)
 
     def _log_response(self, label: str, status: int, body) -> None:
         # _LOGGER.debug only emits when the user clicks "Enable debug
@@ -92,7 +656,8 @@ class SmartSlydrApiClient:
             )
         self._access_token = body["access_token"]
         self._refresh_token_value = body.get("refresh_token")
-        self._token_expires = datetime.now(timezone.utc) + TOKEN_LIFETIME
+        self._token_expires = self._expiry_from(body)
+        self._token_updated()
 
     async def refresh_token(self) -> None:
         url = f"{self._base_url}/token"
@@ -102,68 +667,240 @@ class SmartSlydrApiClient:
             self._log_response("REFRESH_TOKEN", resp.status, body)
             resp.raise_for_status()
         self._access_token = body["access_token"]
-        self._token_expires = datetime.now(timezone.utc) + TOKEN_LIFETIME
+        self._token_expires = self._expiry_from(body)
+        self._token_updated()
 
     async def _request_with_retry(self, label: str, perform):
-        """Retry transient 5xx and connection errors for idempotent calls.
+        """Retry transient 5xx, 429 and connection errors for idempotent calls.
 
         ``perform`` is a zero-arg callable returning a fresh coroutine each
         invocation (a coroutine object can only be awaited once). Only
         called for read-only operations - state-changing calls like
         set_command must not retry, since an ambiguous failure could
-        actuate the device twice.
+        actuate the device twice. Every retry is drawn from the
+        client-wide retry budget; once that's spent, failures raise on
+        the first attempt until it refills.
         """
-        delays = (0.5, 1.5)
-        for attempt, delay in enumerate((*delays, None)):
+        stats = self._retry_stats.setdefault(
+            label, {"calls": 0, "retries": 0, "recovered": 0, "denied": 0}
+        )
+        stats["calls"] += 1
+        self._retry_budget.note_call()
+        delay = RETRY_BASE_DELAY_S
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            throttled = False
             try:
-                return await perform()
+                result = await perform()
             except aiohttp.ClientResponseError as err:
-                if err.status < 500 or delay is None:
-                    raise
-                _LOGGER.debug(
-                    "[%s] HTTP %s on attempt %d, retrying in %ss",
-                    label, err.status, attempt + 1, delay,
+                # After a 429 the bucket is paused for Retry-After; the
+                # next attempt waits on it rather than on a backoff delay.
+                throttled = (
+                    err.status == 429
+                    and self._bucket.paused_for() <= RATE_LIMIT_MAX_WAIT_S
                 )
+                if not (throttled or err.status >= 500):
+                    raise
+                if not self._spend_retry(label, stats, attempt):
+                    raise
+                reason = f"HTTP {err.status}"
             except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as err:
-                if delay is None:
+                if not self._spend_retry(label, stats, attempt):
                     raise
+                reason = type(err).__name__
+            else:
+                if attempt:
+                    stats["recovered"] += 1
+                return result
+            if throttled:
                 _LOGGER.debug(
-                    "[%s] %s on attempt %d, retrying in %ss",
-                    label, type(err).__name__, attempt + 1, delay,
+                    "[%s] %s on attempt %d, retrying after %.1fs",
+                    label, reason, attempt + 1, self._bucket.paused_for(),
                 )
-            await asyncio.sleep(delay)
-        # Unreachable - the loop either returns or raises.
+                continue
+            delay = min(RETRY_MAX_DELAY_S, random.uniform(RETRY_BASE_DELAY_S, delay * 3))
+            _LOGGER.debug(
+                "[%s] %s on attempt %d, retrying in %.2fs",
+                label, reason, attempt + 1, delay,
+            )
+            await _retry_sleep(delay)
+        # Unreachable - the last attempt either returns or raises.
         raise RuntimeError("retry loop exhausted")
 
+    def _spend_retry(self, label: str, stats: dict[str, int], attempt: int) -> bool:
+        """Whether attempt ``attempt`` (0-based) may be followed by a retry."""
+        if attempt >= RETRY_ATTEMPTS:
+            return False
+        if not self._retry_budget.try_spend():
+            stats["denied"] += 1
+            _LOGGER.debug("[%s] retry budget exhausted; not retrying", label)
+            return False
+        stats["retries"] += 1
+        return True
+
+    def _raise_for_status(self, resp: aiohttp.ClientResponse) -> None:
+        if resp.status == 429:
+            pause = _retry_after(resp.headers)
+            _LOGGER.warning(
+                "SmartSlydr API rate limit hit; pausing requests for %.1fs", pause
+            )
+            self._bucket.pause(pause)
+        resp.raise_for_status()
+
     async def _ensure_token(self) -> None:
+        # Fast path: a valid token needs no lock. With the background
+        # refresher running this is every call in steady state.
+        if self._token_valid():
+            return
         async with self._token_lock:
-            now = datetime.now(timezone.utc)
             # Re-check inside the lock - another waiter may have just
             # refreshed; if it did, the staleness check is now false.
-            if not self._access_token or self._token_expires is None or now >= self._token_expires:
-                if self._refresh_token_value:
-                    try:
-                        await self.refresh_token()
-                        return
-                    except aiohttp.ClientResponseError as err:
-                        _LOGGER.debug("Refresh token rejected (%s); re-authenticating", err.status)
-                        self._refresh_token_value = None
-                await self.authenticate()
+            if not self._token_valid():
+                await self._renew_token()
 
-    async def get_devices(self):
+    async def _guarded(self, perform):
+        """Run one request through the circuit breaker."""
+        self._breaker.before_request()
+        try:
+            result = await perform()
+        except (asyncio.CancelledError, SmartSlydrRateLimitedError):
+            # Says nothing about the backend's health either way.
+            self._breaker.release()
+            raise
+        except Exception as err:
+            if _is_outage(err):
+                self._breaker.record_failure()
+            else:
+                # Any other failure still means the backend answered.
+                self._breaker.record_success()
+            raise
+        self._breaker.record_success()
+        return result
+
+    async def _renew_token(self) -> None:
+        """Get a new access token: /token if we can, /auth otherwise. Hold _token_lock."""
+        if self._refresh_token_value:
+            try:
+                await self._guarded(self.refresh_token)
+                return
+            except aiohttp.ClientResponseError as err:
+                _LOGGER.debug("Refresh token rejected (%s); re-authenticating", err.status)
+                self._refresh_token_value = None
+        await self._guarded(self.authenticate)
+
+    def _auth_headers(self) -> dict[str, str]:
+        # Read at request time, so a replay after re-auth picks up the
+        # new token.
+        return {"Authorization": self._access_token}
+
+    def _invalidate_token(self, rejected: str | None) -> None:
+        """Drop ``rejected`` as the access token, unless it's already been replaced.
+
+        Concurrent requests that all got a 401 for the same token end up
+        in one renewal: the first drops it, the rest see a different (or
+        no) token and just wait on _ensure_token. The refresh token is
+        kept - /token is cheaper than /auth and _renew_token falls back
+        if it's been revoked too.
+        """
+        if self._access_token != rejected:
+            return
+        self._access_token = None
+        self._token_expires = None
+        self._schedule_token_refresh()
+
+    async def _authorized(self, label: str, perform):
+        """Run ``perform`` with a valid token; on 401/403, renew and replay once.
+
+        The backend can revoke a token before its local expiry; without
+        this every call would fail with it until then. Replaying is safe
+        for commands too - a rejected token means the request was never
+        applied. A rejection of the renewed token too means the account
+        itself is refused, and raises SmartSlydrAuthError so the
+        coordinator starts reauth.
+        """
         await self._ensure_token()
-        headers = {"Authorization": self._access_token}
+        token = self._access_token
+        try:
+            return await perform()
+        except aiohttp.ClientResponseError as err:
+            if err.status not in (401, 403):
+                raise
+            _LOGGER.debug(
+                "[%s] HTTP %s with current token; renewing and replaying once",
+                label, err.status,
+            )
+        self._invalidate_token(token)
+        await self._ensure_token()
+        try:
+            return await perform()
+        except aiohttp.ClientResponseError as err:
+            if err.status not in (401, 403):
+                raise
+            raise SmartSlydrAuthError(
+                f"SmartSlydr rejected a freshly issued token ({label})"
+            ) from err
 
+    async def _single_flight(self, label: str, payload, perform):
+        """Share one in-flight ``perform()`` among concurrent identical reads.
+
+        A scheduled poll, a couple of fast-poll follow-ups and a repair
+        retry regularly ask for the same thing at the same moment; they
+        all get the one response. Only for reads - two identical
+        commands are two intended actuations. Each caller awaits through
+        a shield, so one of them being cancelled doesn't cancel the
+        request for the others.
+        """
+        key = (label, self._base_url, json.dumps(payload, sort_keys=True, default=str))
+        task = self._inflight.get(key)
+        if task is None:
+            self._read_stats["upstream"] += 1
+            task = asyncio.get_running_loop().create_task(perform())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._single_flight_done(key, t))
+        else:
+            self._read_stats["coalesced"] += 1
+            _LOGGER.debug("[%s] joining identical in-flight request", label)
+        return await asyncio.shield(task)
+
+    def _single_flight_done(self, key, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error retrieved; if every caller was cancelled nobody
+        # else will, and asyncio would log it as never retrieved.
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def rate_limited(self) -> int:
+        """How many 429 responses this client has received so far."""
+        return self._bucket.rate_limited
+
+    def commands_pending(self) -> bool:
+        """Whether a command is waiting to be sent (batching or for budget)."""
+        return self._command_batch is not None or self._bucket.pending(
+            PRIORITY_COMMAND
+        )
+
+    async def get_devices(self):
         async def _do_request():
+            await self._bucket.acquire(PRIORITY_POLL)
             async with self._session.get(
-                f"{self._base_url}/devices", headers=headers
+                f"{self._base_url}/devices", headers=self._auth_headers()
             ) as resp:
                 body = await resp.json(content_type=None)
                 self._log_response("GET_DEVICES", resp.status, body)
-                resp.raise_for_status()
+                self._raise_for_status(resp)
             return body
 
-        data = await self._request_with_retry("GET_DEVICES", _do_request)
+        data = await self._single_flight(
+            "GET_DEVICES",
+            None,
+            lambda: self._authorized(
+                "GET_DEVICES",
+                lambda: self._request_with_retry(
+                    "GET_DEVICES", lambda: self._guarded(_do_request)
+                ),
+            ),
+        )
 
         _raise_if_upstream_error("GET_DEVICES", data)
 
@@ -179,36 +916,123 @@ class SmartSlydrApiClient:
 
         return rooms
 
-    async def get_status(self, commands):
-        await self._ensure_token()
-        headers = {"Authorization": self._access_token}
+    async def get_status(self, commands, *, priority: int = PRIORITY_STATUS):
+        """Read ``commands`` via /operation/get.
+
+        ``priority`` is PRIORITY_STATUS for targeted reads; the regular
+        poll passes PRIORITY_POLL.
+        """
         payload = {"commands": commands}
 
         async def _do_request():
+            await self._bucket.acquire(priority)
             async with self._session.post(
-                f"{self._base_url}/operation/get", json=payload, headers=headers
+                f"{self._base_url}/operation/get",
+                json=payload,
+                headers=self._auth_headers(),
             ) as resp:
                 body = await resp.json(content_type=None)
                 self._log_response("GET_STATUS", resp.status, body)
-                resp.raise_for_status()
+                self._raise_for_status(resp)
             return body
 
-        data = await self._request_with_retry("GET_STATUS", _do_request)
+        data = await self._single_flight(
+            "GET_STATUS",
+            payload,
+            lambda: self._authorized(
+                "GET_STATUS",
+                lambda: self._request_with_retry(
+                    "GET_STATUS", lambda: self._guarded(_do_request)
+                ),
+            ),
+        )
         _raise_if_upstream_error("GET_STATUS", data)
         if not isinstance(data, dict):
             return []
         return data.get("response", [])
 
     async def set_command(self, setcommands):
-        await self._ensure_token()
-        headers = {"Authorization": self._access_token}
+        """Send ``setcommands``, batched with any other commands sent meanwhile.
+
+        Commands arriving within COMMAND_BATCH_WINDOW_S of each other go
+        out as one /operation call, so a scene closing every door is one
+        request rather than one per door. Each caller still gets its own
+        result: the response entries for its devices (or the whole
+        response if the backend doesn't label them), or the exception if
+        the call failed. A caller that targets a device already in the
+        open batch starts the next one instead, so two commands for the
+        same door are never merged. Batches post strictly in order, each
+        after the one before it has finished, so they keep their order
+        even when the earlier request is slow.
+        """
+        entries = list(setcommands)
+        device_ids = {e.get("device_id") for e in entries if isinstance(e, dict)}
+        self._command_stats["calls"] += 1
+        batch = self._command_batch
+        if batch is not None and batch.device_ids & device_ids:
+            batch.flush.set()
+            batch = None
+        if batch is None:
+            previous = self._command_tail
+            if previous is not None and previous.done():
+                previous = None
+            batch = self._command_batch = _CommandBatch()
+            batch.task = self._command_tail = asyncio.get_running_loop().create_task(
+                self._send_command_batch(batch, previous)
+            )
+        future = asyncio.get_running_loop().create_future()
+        batch.entries.extend(entries)
+        batch.device_ids |= device_ids
+        batch.waiters.append((future, device_ids))
+        return await future
+
+    async def _send_command_batch(
+        self, batch: _CommandBatch, previous: asyncio.Task | None
+    ) -> None:
+        try:
+            await asyncio.wait_for(batch.flush.wait(), COMMAND_BATCH_WINDOW_S)
+        except asyncio.TimeoutError:
+            pass
+        if self._command_batch is batch:
+            self._command_batch = None
+        if previous is not None:
+            await asyncio.wait([previous])
+        self._command_stats["requests"] += 1
+        try:
+            response = await self._post_commands(batch.entries)
+        except Exception as err:  # noqa: BLE001 - handed to every caller
+            for future, _ in batch.waiters:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for future, device_ids in batch.waiters:
+            if future.done():
+                continue
+            mine = [
+                r
+                for r in (response if isinstance(response, list) else ())
+                if isinstance(r, dict) and r.get("device_id") in device_ids
+            ]
+            future.set_result(mine or response)
+
+    async def _post_commands(self, setcommands):
         payload = {"setcommands": setcommands}
-        async with self._session.post(
-            f"{self._base_url}/operation", json=payload, headers=headers
-        ) as resp:
-            data = await resp.json(content_type=None)
-            self._log_response("SET_COMMAND", resp.status, data)
-            resp.raise_for_status()
+
+        async def _do_request():
+            await self._bucket.acquire(PRIORITY_COMMAND)
+            async with self._session.post(
+                f"{self._base_url}/operation",
+                json=payload,
+                headers=self._auth_headers(),
+            ) as resp:
+                body = await resp.json(content_type=None)
+                self._log_response("SET_COMMAND", resp.status, body)
+                self._raise_for_status(resp)
+            return body
+
+        data = await self._authorized(
+            "SET_COMMAND", lambda: self._guarded(_do_request)
+        )
         _raise_if_upstream_error("SET_COMMAND", data)
         if not isinstance(data, dict):
             return []
@@ -219,6 +1043,22 @@ class SmartSlydrApiError(Exception):
     """Raised when the SmartSlydr API returns an unexpected payload."""
 
 
+class SmartSlydrCircuitOpenError(SmartSlydrApiError):
+    """Raised without sending anything while the circuit breaker is open.
+
+    The coordinator maps it to the "backend unreachable" repair issue,
+    not the "unexpected response" one its parent class gets.
+    """
+
+
+class SmartSlydrRateLimitedError(SmartSlydrApiError):
+    """Raised without sending anything while a long Retry-After pause runs.
+
+    Only when more than RATE_LIMIT_MAX_WAIT_S of the pause is left;
+    shorter pauses are waited out.
+    """
+
+
 class SmartSlydrAuthError(SmartSlydrApiError):
     """Raised when SmartSlydr rejects the stored credentials.
 
@@ -14,12 +14,19 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .api_client import SmartSlydrApiClient, SmartSlydrAuthError
 from .const import (
     CONF_BASE_URL,
+    CONF_MOTION_MODE,
     CONF_PASSWORD,
+    CONF_STALE_DEVICE_POLLS,
     CONF_USERNAME,
     DEFAULT_BASE_URL,
+    DEFAULT_MOTION_MODE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_DEVICE_POLLS,
     DOMAIN,
+    MOTION_MODE_ATTRIBUTES,
+    MOTION_MODE_TICK,
 )
+from .storage import async_get_token_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,6 +56,12 @@ class SmartSlydrConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as err:  # noqa: BLE001 - last-ditch diagnostic
             _LOGGER.exception("SmartSlydr auth unexpected error: %s", err)
             return "unknown"
+        # Hand the fresh token to the setup that follows instead of
+        # throwing it away and authenticating again a moment later.
+        state = client.token_state()
+        if state is not None:
+            tokens = await async_get_token_store(self.hass)
+            tokens.async_set(username, DEFAULT_BASE_URL, state)
         return None
 
     async def async_step_user(self, user_input=None):
@@ -126,7 +139,7 @@ class OptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         if user_input is not None:
             # Merge into existing options so we don't wipe internal-only
-            # keys (e.g. calibrated_move_duration_<id>) that the form
+            # keys (e.g. move_duration_<id> overrides) that the form
             # doesn't expose.
             merged = dict(self._config_entry.options)
             merged.update(user_input)
@@ -141,5 +154,15 @@ class OptionsFlow(config_entries.OptionsFlow):
                 CONF_BASE_URL,
                 default=self._config_entry.options.get(CONF_BASE_URL, DEFAULT_BASE_URL),
             ): vol.All(str, vol.Length(min=1, max=512)),
+            vol.Optional(
+                CONF_MOTION_MODE,
+                default=self._config_entry.options.get(CONF_MOTION_MODE, DEFAULT_MOTION_MODE),
+            ): vol.In([MOTION_MODE_TICK, MOTION_MODE_ATTRIBUTES]),
+            vol.Optional(
+                CONF_STALE_DEVICE_POLLS,
+                default=self._config_entry.options.get(
+                    CONF_STALE_DEVICE_POLLS, DEFAULT_STALE_DEVICE_POLLS
+                ),
+            ): vol.All(int, vol.Range(min=1, max=1000)),
         })
         return self.async_show_form(step_id="init", data_schema=schema)
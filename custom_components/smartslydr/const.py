@@ -5,18 +5,37 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_BASE_URL = "base_url"
 
-# Per-device option keys for the move-duration calibration system in
-# cover.py. The user-supplied override (if set) wins over the auto-
-# calibrated value, which wins over DEFAULT_MOVE_DURATION.
+# Per-device option key for a user-supplied move duration in cover.py.
+# It wins over the auto-calibrated value (kept in the calibration store,
+# see storage.py), which wins over DEFAULT_MOVE_DURATION. Calibrated
+# values used to live in options under CALIBRATED_DURATION_OPTION_PREFIX;
+# setup migrates them out.
 MOVE_DURATION_OPTION_PREFIX = "move_duration_"
 CALIBRATED_DURATION_OPTION_PREFIX = "calibrated_move_duration_"
 DEFAULT_MOVE_DURATION = 10.0
 
 SERVICE_RECALIBRATE_COVER = "recalibrate_cover"
 
+# How a moving cover is presented. "tick" interpolates
+# current_cover_position locally (one state write per integer step) so
+# stock cover cards animate. "attributes" publishes the move's start,
+# target, start time and expected duration as attributes once the door
+# has accepted the command, clears them at the end of the move, and
+# leaves interpolation to the frontend or automation reading them.
+CONF_MOTION_MODE = "motion_mode"
+MOTION_MODE_TICK = "tick"
+MOTION_MODE_ATTRIBUTES = "attributes"
+DEFAULT_MOTION_MODE = MOTION_MODE_TICK
+
 # Default scan interval (in seconds) for polling device data
 DEFAULT_SCAN_INTERVAL = 300
 
+# A device missing from this many consecutive successful polls is
+# removed from the device registry (with its entities). Polls, not
+# time, so a long scan interval doesn't make removal hair-trigger.
+CONF_STALE_DEVICE_POLLS = "stale_device_polls"
+DEFAULT_STALE_DEVICE_POLLS = 5
+
 # Default upstream API base. Overridable per-entry via the options flow
 # so a future LycheeThings domain rotation, or a local proxy for
 # debugging, doesn't require a code change.
@@ -0,0 +1,834 @@
+# config/custom_components/smartslydr/coordinator.py
+"""Polling coordinator for the SmartSlydr integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr, issue_registry as ir
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api_client import (
+    PRIORITY_POLL,
+    SmartSlydrApiClient,
+    SmartSlydrApiError,
+    SmartSlydrAuthError,
+    SmartSlydrCircuitOpenError,
+    SmartSlydrRateLimitedError,
+    command_outcome_unknown,
+)
+from .const import CONF_STALE_DEVICE_POLLS, DEFAULT_STALE_DEVICE_POLLS, DOMAIN
+from .helpers import (
+    SmartSlydrCoordinatorData,
+    SmartSlydrDevice,
+    coerce_petpass_bool,
+    diff_snapshots,
+    merge_statuses,
+    parse_devices,
+)
+from .storage import SmartSlydrSnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+ISSUE_UPSTREAM_UNEXPECTED = "upstream_unexpected_response"
+ISSUE_UPSTREAM_UNAVAILABLE = "upstream_unavailable"
+_TRANSIENT_ISSUES = (ISSUE_UPSTREAM_UNEXPECTED, ISSUE_UPSTREAM_UNAVAILABLE)
+
+
+def _create_issue(hass: HomeAssistant, key: str) -> None:
+    ir.async_create_issue(
+        hass,
+        DOMAIN,
+        key,
+        # Fixable so the card has a "Submit" button that runs a retry
+        # via repairs.py instead of only the dismiss-forever "Ignore"
+        # button. Submit doesn't mark the issue dismissed-by-version,
+        # so the card reappears if the underlying problem recurs.
+        is_fixable=True,
+        severity=ir.IssueSeverity.WARNING,
+        translation_key=key,
+    )
+
+
+def _clear_transient_issues(hass: HomeAssistant) -> None:
+    for key in _TRANSIENT_ISSUES:
+        ir.async_delete_issue(hass, DOMAIN, key)
+
+
+# Post-command verification: when a user issues a command, we want to
+# see real state quickly so optimistic writes get reconciled. Instead of
+# polling on a fixed cadence, each command registers an expectation
+# (device, field, target value, expected arrival) and the coordinator
+# re-reads just that field via a targeted /operation/get at the
+# predicted arrival plus VERIFY_MARGIN_S. If the value hasn't settled
+# yet, it retries after each VERIFY_BACKOFF_S step, then gives up and
+# leaves reconciliation to the regular poll.
+#
+# History: the original blanket fast-poll window (5s, then 10s, for
+# 30s after any command) hit /devices and every device's petpass each
+# tick, which tripped 429s on the upstream AWS API Gateway when several
+# covers were polled concurrently, and often sampled mid-move and
+# missed the arrival anyway. The backoff tail reaches ~60s because
+# petpass propagation has been observed to take longer than 30s.
+VERIFY_MARGIN_S = 1.5
+VERIFY_BACKOFF_S = (2.0, 4.0, 8.0, 16.0, 32.0)
+
+# A move the cover is timing for its motion model also gets a read half
+# way to the predicted arrival, if that's at least this far out. It
+# lands mid-move if the door is on time or slow, and catches a door
+# that's much faster than predicted - the arrival read alone can only
+# tell how slow a door is.
+MIDWAY_READ_MIN_S = 2.0
+
+# A polled position within this many points of the target counts as
+# arrived (same tolerance the cover's calibration uses).
+_POSITION_TOLERANCE = 2
+
+# Adaptive polling (AIMD): a poll that hits throttling or a server-side
+# failure multiplies the interval by BACKOFF_FACTOR, up to
+# MAX_POLL_INTERVAL; each clean poll after that takes RECOVERY_STEP off
+# until it's back at the configured scan interval. Polling a gateway
+# that's shedding load at the usual rate only prolongs the overload.
+BACKOFF_FACTOR = 2
+MAX_POLL_INTERVAL = timedelta(minutes=10)
+RECOVERY_STEP = timedelta(seconds=30)
+
+
+def _overload_reason(err: BaseException) -> str | None:
+    """Why ``err`` calls for slower polling, or None if it doesn't."""
+    if isinstance(err, (SmartSlydrAuthError, SmartSlydrCircuitOpenError)):
+        # An open circuit already keeps requests off the backend.
+        return None
+    if isinstance(err, SmartSlydrRateLimitedError):
+        return "rate_limited"
+    if isinstance(err, aiohttp.ClientResponseError):
+        if err.status == 429:
+            return "rate_limited"
+        if err.status >= 500:
+            return f"http_{err.status}"
+        return None
+    if isinstance(err, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(err, SmartSlydrApiError):
+        return "upstream_error"
+    return None
+
+
+# Scheduled polls in a row that may be skipped because a user command is
+# waiting for request budget. One keeps command latency flat under load
+# without letting a busy door starve the rest of the account.
+_MAX_SKIPPED_POLLS = 1
+
+# How long a skipped poll is put off. Long enough for a queued command
+# to get its budget, short enough that the rest of the account doesn't
+# wait out a whole scan interval for it.
+_POLL_DEFER_S = 2.0
+
+# Expectations whose due times fall within this window of the earliest
+# one are verified in the same request.
+_VERIFY_BATCH_WINDOW_S = 0.5
+
+
+@dataclass(slots=True)
+class _Expectation:
+    """A pending optimistic write awaiting confirmation from the backend.
+
+    ``value`` None means "just re-read once" (e.g. after a stop, where
+    there's no target to compare against). ``arrive_at`` is set while
+    ``due`` is a mid-move read; the next one goes out then.
+    """
+
+    value: Any
+    due: float
+    attempt: int = 0
+    arrive_at: float | None = None
+
+
+def _petpass_commands(device_ids) -> list[dict]:
+    return [{"device_id": did, "command": "petpass"} for did in device_ids]
+
+
+def _returned_fields(statuses, requested) -> set[tuple[str, str]]:
+    """The ``(device_id, field)`` pairs of ``requested`` that ``statuses`` answers."""
+    returned = set()
+    for st in statuses or []:
+        if not isinstance(st, dict):
+            continue
+        for did, field in requested:
+            if st.get("device_id") != did or st.get(field) is None:
+                continue
+            if field == "petpass" and coerce_petpass_bool(st[field]) is None:
+                continue
+            returned.add((did, field))
+    return returned
+
+
+def _parse_petpass_statuses(
+    statuses, prev_petpass: dict[str, bool]
+) -> dict[str, bool]:
+    """Turn an /operation/get petpass response into device_id -> on/off."""
+    petpass_states: dict[str, bool] = {}
+    for st in statuses or []:
+        did = st.get("device_id")
+        if did is None or "petpass" not in st:
+            continue
+        raw = st.get("petpass")
+        parsed = coerce_petpass_bool(raw)
+        if parsed is None:
+            # Unrecognized shape - log once at warning and
+            # keep the previous value if any.
+            _LOGGER.warning(
+                "Unrecognized petpass value for %s: %r (type %s)",
+                did,
+                raw,
+                type(raw).__name__,
+            )
+            if did in prev_petpass:
+                petpass_states[did] = prev_petpass[did]
+            continue
+        petpass_states[did] = parsed
+    return petpass_states
+
+
+class SmartSlydrCoordinator(DataUpdateCoordinator[SmartSlydrCoordinatorData]):
+    """Coordinator with targeted refreshes and post-command verification."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: SmartSlydrApiClient,
+        *,
+        default_interval: timedelta,
+        snapshot_store: SmartSlydrSnapshotStore | None = None,
+        **kwargs,
+    ):
+        super().__init__(hass, update_interval=default_interval, **kwargs)
+        self.client = client
+        self._snapshot_store = snapshot_store
+        # True while self.data is the snapshot persisted by a previous
+        # run rather than anything polled by this one. Entities report
+        # it as assumed_state.
+        self.restored = False
+        self._default_interval = default_interval
+        # (device_id, field) -> pending confirmation, plus the single
+        # timer and task that verify whichever is due first.
+        self._expectations: dict[tuple[str, str], _Expectation] = {}
+        self._verify_unsub = None
+        self._verify_task: asyncio.Task | None = None
+        # device_id -> fields that changed in the last successful update,
+        # or None for "everything" (first poll, or recovery after a failed
+        # one when every entity needs to re-publish availability).
+        self._changes: dict[str, frozenset[str]] | None = None
+        # device_id -> loop time its position was last actually read.
+        # A targeted refresh of one door republishes the whole snapshot;
+        # the cover's motion model uses this to tell a fresh sample from
+        # a carried-over value.
+        self._position_read_at: dict[str, float] = {}
+        # Device-set tracking. _announced holds the ids platforms have
+        # entities for (seeded from the snapshot they were built from);
+        # _missing_polls counts consecutive successful polls each known
+        # device has been absent from.
+        self._announced: set[str] | None = None
+        self._missing_polls: dict[str, int] = {}
+        self._device_listeners: list[Callable[[list[SmartSlydrDevice]], None]] = []
+        self._skipped_polls = 0
+        self._repoll_unsub = None
+        # Why update_interval is above _default_interval (see
+        # _overload_reason), "recovering" on the way back down, or None.
+        self._interval_reason: str | None = None
+        # client.rate_limited as of the last poll; a rise means a 429
+        # was absorbed by a retry somewhere since.
+        self._rate_limited_seen = client.rate_limited
+
+    async def _async_fetch(self, known_ids: list[str]):
+        """Fetch /devices and the petpass states of ``known_ids`` concurrently.
+
+        Device membership almost never changes between polls, so the
+        petpass query for the previous snapshot's devices goes out
+        alongside /devices instead of after it - one round-trip of
+        latency per poll instead of two. Returns ``(rooms, statuses)``
+        where ``statuses`` is None (nothing queried), the response list,
+        or the exception the petpass query raised.
+        """
+        if not known_ids:
+            return await self.client.get_devices(), None
+        rooms, statuses = await asyncio.gather(
+            self.client.get_devices(),
+            self.client.get_status(_petpass_commands(known_ids), priority=PRIORITY_POLL),
+            return_exceptions=True,
+        )
+        if isinstance(rooms, BaseException):
+            raise rooms
+        return rooms, statuses
+
+    async def _async_update_data(self) -> SmartSlydrCoordinatorData:
+        hass = self.hass
+        prev = self.data
+        if (
+            prev is not None
+            and not self.restored
+            and self.last_update_success
+            and self._skipped_polls < _MAX_SKIPPED_POLLS
+            and self.client.commands_pending()
+        ):
+            # A user command is queued for budget; don't put a full poll
+            # in front of it. The state it would fetch is about to change
+            # anyway, and the command's verification read follows.
+            # Never while failing, so a repair retry always really polls.
+            # Republishing prev is not a change: no entity writes state.
+            self._skipped_polls += 1
+            self._changes = {}
+            _LOGGER.debug("Deferring poll while a command is pending")
+            self._schedule_repoll()
+            return prev
+        self._skipped_polls = 0
+        self._cancel_repoll()
+        known_ids = list(prev.devices) if prev is not None else []
+        try:
+            rooms, known_statuses = await self._async_fetch(known_ids)
+        except SmartSlydrAuthError as err:
+            # Triggers HA's reauth flow (a "Repair credentials" card on
+            # the integration page). User re-enters the password without
+            # losing entity history.
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except SmartSlydrCircuitOpenError as err:
+            # Failed fast without a request - the backend was already
+            # found unreachable. Keep the same repair card; its Submit
+            # asks the client for a probe. Logged when the circuit
+            # opened, not again on every tick.
+            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
+            raise UpdateFailed(str(err)) from err
+        except SmartSlydrRateLimitedError as err:
+            # Failed fast under a long Retry-After pause; treated like
+            # the 429 that started it.
+            self._async_back_off(_overload_reason(err))
+            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
+            raise UpdateFailed(str(err)) from err
+        except SmartSlydrApiError as err:
+            # SmartSlydrApiError messages are sanitized at construction
+            # (no upstream payload echo), safe to surface. Also signal a
+            # repair issue so the user sees a clear "this is server-side"
+            # explanation on the integration page.
+            self._async_back_off(_overload_reason(err))
+            _create_issue(hass, ISSUE_UPSTREAM_UNEXPECTED)
+            raise UpdateFailed(str(err)) from err
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            # aiohttp.ClientError is the parent of ClientResponseError,
+            # ClientConnectorError, and aiohttp.InvalidURL. OSError covers
+            # raw socket/DNS errors that aren't always wrapped. Any of
+            # these warrants a repair card with the URL-reset fix flow.
+            self._async_back_off(_overload_reason(err))
+            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
+            _LOGGER.warning(
+                "SmartSlydr backend unreachable (%s): %s",
+                type(err).__name__,
+                err,
+            )
+            raise UpdateFailed("Error fetching devices") from err
+        except Exception as err:
+            # Truly unexpected (likely a Python-side bug). Still surface a
+            # repair card so the user has access to the URL-reset fix
+            # flow if that turns out to be the underlying cause; the full
+            # traceback hits the log so the bug stays diagnosable.
+            _create_issue(hass, ISSUE_UPSTREAM_UNAVAILABLE)
+            _LOGGER.exception("Unexpected error fetching devices")
+            raise UpdateFailed("Error fetching devices") from err
+
+        read_at = hass.loop.time()
+
+        # Successful poll - clear any stale repair cards.
+        _clear_transient_issues(hass)
+
+        # Parse and index once per poll; every entity reads its typed
+        # device record through this map instead of re-validating raw
+        # JSON on each property access.
+        parsed_rooms, devices = parse_devices(rooms)
+
+        # /devices.petpass and /operation/get?command=petpass look like
+        # they overlap, but they're different: /devices.petpass is the
+        # *configuration* (the list of allowed-pet slot entries),
+        # while /operation/get returns the *current on/off* state of
+        # the petpass toggle. Both are needed - the switch's is_on
+        # reads this map; allowed_pets reads /devices.petpass.
+        #
+        # The pipelined query only covered devices from the previous
+        # snapshot; anything new this poll (or everything, on the first
+        # poll) gets a follow-up query for just those ids.
+        known = set(known_ids)
+        new_ids = [did for did in devices if did not in known]
+        batches = []
+        if known_ids:
+            batches.append((known_ids, known_statuses))
+        if new_ids:
+            try:
+                new_statuses = await self.client.get_status(
+                    _petpass_commands(new_ids), priority=PRIORITY_POLL
+                )
+            except Exception as err:  # noqa: BLE001 - handled per batch below
+                new_statuses = err
+            batches.append((new_ids, new_statuses))
+
+        # On a transient failure (429, network blip), retain the previous
+        # poll's petpass_states - clearing them would flip every petpass
+        # switch to OFF in the UI for one cycle, which is a worse lie
+        # than showing slightly stale data.
+        prev_petpass = prev.petpass_states if prev is not None else {}
+        petpass_states: dict[str, bool] = {}
+        for batch_ids, statuses in batches:
+            if isinstance(statuses, BaseException):
+                _LOGGER.warning(
+                    "Failed to fetch petpass states (keeping last known): %s",
+                    statuses,
+                )
+                petpass_states.update(
+                    (did, prev_petpass[did])
+                    for did in batch_ids
+                    if did in prev_petpass
+                )
+                continue
+            # Success: replace with fresh values rather than merging.
+            petpass_states.update(_parse_petpass_statuses(statuses, prev_petpass))
+        # Keep only devices still on the account, so a removed device
+        # drops out cleanly.
+        petpass_states = {
+            did: state for did, state in petpass_states.items() if did in devices
+        }
+
+        # A throttled petpass query, or a 429 that a retry absorbed,
+        # still means the gateway is under pressure.
+        reason = next(
+            (
+                r
+                for _, statuses in batches
+                if isinstance(statuses, BaseException)
+                and (r := _overload_reason(statuses))
+            ),
+            None,
+        )
+        if reason is None and self.client.rate_limited > self._rate_limited_seen:
+            reason = "rate_limited"
+        if reason is not None:
+            self._async_back_off(reason)
+        else:
+            self._async_recover_interval()
+
+        data = SmartSlydrCoordinatorData(
+            rooms=parsed_rooms, petpass_states=petpass_states, devices=devices
+        )
+        self._position_read_at = dict.fromkeys(devices, read_at)
+        self._track_device_set(prev, devices)
+        self._process_snapshot(data)
+        self.restored = False
+        if self._snapshot_store is not None:
+            self._snapshot_store.async_save(data)
+        return data
+
+    async def async_restore_snapshot(self) -> bool:
+        """Publish the persisted snapshot ahead of the first live poll.
+
+        Returns False if there isn't one (first run, or an unreadable
+        file); the caller then has to wait for a live refresh.
+        """
+        if self._snapshot_store is None:
+            return False
+        data = await self._snapshot_store.async_load()
+        if data is None:
+            return False
+        self.data = data
+        self.restored = True
+        return True
+
+    @callback
+    def async_add_device_listener(
+        self, listener: Callable[[list[SmartSlydrDevice]], None]
+    ) -> Callable[[], None]:
+        """Call ``listener`` with devices that appear after setup.
+
+        Platforms build entities from the snapshot at setup and use this
+        to add entities for doors added to the account later, without a
+        reload. Returns an unsubscribe callable.
+        """
+        self._device_listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._device_listeners.remove(listener)
+
+        return _remove
+
+    @callback
+    def _track_device_set(
+        self,
+        prev: SmartSlydrCoordinatorData | None,
+        devices: dict[str, SmartSlydrDevice],
+    ) -> None:
+        """Announce new devices and retire ones gone for too many polls."""
+        dev_reg = dr.async_get(self.hass)
+        entry = self.config_entry
+        if self._announced is None:
+            self._announced = set(prev.devices if prev is not None else devices)
+            # Devices registered in an earlier run but absent now get
+            # counted down too, not just ones that vanish while running.
+            if entry is not None:
+                for device in dr.async_entries_for_config_entry(
+                    dev_reg, entry.entry_id
+                ):
+                    for domain, did in device.identifiers:
+                        if domain == DOMAIN:
+                            self._missing_polls.setdefault(did, 0)
+
+        added = [dev for did, dev in devices.items() if did not in self._announced]
+        for did in devices:
+            self._missing_polls.pop(did, None)
+        for did in self._announced - devices.keys():
+            self._missing_polls.setdefault(did, 0)
+
+        limit = (entry.options if entry is not None else {}).get(
+            CONF_STALE_DEVICE_POLLS, DEFAULT_STALE_DEVICE_POLLS
+        )
+        for did in list(self._missing_polls):
+            self._missing_polls[did] += 1
+            if self._missing_polls[did] < limit:
+                continue
+            del self._missing_polls[did]
+            self._announced.discard(did)
+            device = dev_reg.async_get_device(identifiers={(DOMAIN, did)})
+            if device is not None and entry is not None:
+                _LOGGER.info(
+                    "Removing SmartSlydr device %s: missing from %d polls", did, limit
+                )
+                # Drops the device (and its entities) for this entry
+                # only; entities of devices still present are untouched.
+                dev_reg.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+        if added:
+            self._announced.update(dev.device_id for dev in added)
+            _LOGGER.debug(
+                "New SmartSlydr devices: %s", [dev.device_id for dev in added]
+            )
+            for listener in list(self._device_listeners):
+                listener(added)
+
+    def _process_snapshot(self, new_data: SmartSlydrCoordinatorData) -> None:
+        """Bookkeeping for a snapshot that's about to be published.
+
+        Diffs it against the current one for per-entity change detection
+        and settles any pending expectations it confirms, so a regular
+        poll that already shows the target saves the verification read.
+        """
+        # A restored snapshot is as stale as no snapshot: every entity
+        # has to re-publish, if only to drop assumed_state.
+        previous = (
+            self.data if self.last_update_success and not self.restored else None
+        )
+        self._changes = diff_snapshots(previous, new_data)
+        for key, exp in list(self._expectations.items()):
+            if exp.value is not None and self._is_settled(new_data, *key, exp.value):
+                del self._expectations[key]
+        if not self._expectations:
+            self._cancel_verify_timer()
+
+    @callback
+    def async_device_changed(self, device_id: str, fields) -> bool:
+        """Return True if any of ``fields`` changed for ``device_id``.
+
+        Entities call this from _handle_coordinator_update to skip the
+        state write when nothing they render moved. A failed update
+        always reports a change so the unavailable state gets written.
+        """
+        if not self.last_update_success or self._changes is None:
+            return True
+        changed = self._changes.get(device_id)
+        return changed is not None and not changed.isdisjoint(fields)
+
+    @callback
+    def async_set_update_interval(self, interval: timedelta) -> None:
+        """Apply a new polling interval to the running coordinator.
+
+        Reschedules the pending poll so the change takes effect now, not
+        after one more cycle at the old interval. A backed-off interval
+        that is longer than the new one is kept until polls recover.
+        """
+        self._default_interval = interval
+        if self._interval_reason is None or self.update_interval < interval:
+            self.update_interval = interval
+            self._interval_reason = None
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def _async_back_off(self, reason: str | None) -> None:
+        """Multiply the poll interval after an overload-type failure."""
+        self._rate_limited_seen = self.client.rate_limited
+        if reason is None:
+            return
+        ceiling = max(MAX_POLL_INTERVAL, self._default_interval)
+        interval = min(
+            max(self.update_interval, self._default_interval) * BACKOFF_FACTOR,
+            ceiling,
+        )
+        if interval != self.update_interval:
+            _LOGGER.warning(
+                "SmartSlydr API under pressure (%s); polling every %ss",
+                reason,
+                int(interval.total_seconds()),
+            )
+        self.update_interval = interval
+        self._interval_reason = reason
+
+    @callback
+    def _async_recover_interval(self) -> None:
+        """Step the poll interval back toward the configured one after a clean poll."""
+        self._rate_limited_seen = self.client.rate_limited
+        if self._interval_reason is None:
+            return
+        self.update_interval = max(
+            self.update_interval - RECOVERY_STEP, self._default_interval
+        )
+        if self.update_interval == self._default_interval:
+            _LOGGER.info("SmartSlydr API recovered; polling at the configured interval")
+            self._interval_reason = None
+        else:
+            self._interval_reason = "recovering"
+
+    @callback
+    def polling_state(self) -> dict[str, Any]:
+        """Effective and configured poll interval, and why they differ."""
+        return {
+            "interval_s": self.update_interval.total_seconds(),
+            "configured_interval_s": self._default_interval.total_seconds(),
+            "reason": self._interval_reason,
+        }
+
+    @callback
+    def position_read_at(self, device_id: str) -> float | None:
+        """Return the loop time ``device_id``'s position was last read."""
+        return self._position_read_at.get(device_id)
+
+    async def async_refresh_devices(self, targets) -> set[tuple[str, str]]:
+        """Re-read selected fields of selected devices and merge them in.
+
+        ``targets`` is an iterable of ``(device_id, field)`` pairs where
+        field is an /operation/get command (``position`` or ``petpass``).
+        Costs one small request instead of the full /devices +
+        every-device petpass cycle. Failures are logged and swallowed:
+        the regular poll is still the source of truth for availability,
+        so a missed targeted read just means one less sample. Returns
+        the requested ``(device_id, field)`` pairs the response actually
+        carried a value for - empty if the read failed. A pair missing
+        from it is still the old value in the published snapshot.
+        """
+        requested = set(targets)
+        commands = [
+            {"device_id": did, "command": field} for did, field in sorted(requested)
+        ]
+        if not commands or self.data is None:
+            return set()
+        try:
+            statuses = await self.client.get_status(commands)
+        except Exception as err:  # noqa: BLE001 - best effort, see above
+            _LOGGER.debug("Targeted refresh failed for %s: %s", commands, err)
+            return set()
+        read_at = self.hass.loop.time()
+        data = merge_statuses(self.data, statuses)
+        for did, dev in data.devices.items():
+            if dev is not self.data.devices.get(did):
+                self._position_read_at[did] = read_at
+        self._process_snapshot(data)
+        # Publish without async_set_updated_data: that would push back
+        # the next full poll, and sensors only refresh on full polls.
+        self.data = data
+        self.async_update_listeners()
+        return _returned_fields(statuses, requested)
+
+    async def async_send_command(
+        self,
+        device_id: str,
+        commands: list[dict],
+        field: str,
+        applied: Callable[[SmartSlydrCoordinatorData], bool] | None,
+    ) -> None:
+        """Send ``commands`` to one device, resolving an ambiguous failure.
+
+        set_command never retries on its own: a timeout or 5xx may come
+        after the door already acted. Here such a failure is followed by
+        a read of ``field``; if ``applied`` says the command took effect
+        the call succeeds, otherwise it is sent exactly once more. If
+        the read fails or doesn't return ``field`` for the device, the
+        original error is raised - guessing could actuate the door twice. ``applied`` None means the command
+        is safe to repeat blindly (stop), so it is retried without a
+        read. Other failures raise as-is.
+        """
+        setcommands = [{"device_id": device_id, "commands": commands}]
+        try:
+            await self.client.set_command(setcommands)
+            return
+        except Exception as err:
+            if not command_outcome_unknown(err):
+                raise
+            first_error = err
+        if applied is not None:
+            # Only a value that came back in this read settles it; the
+            # snapshot's would be from before the command.
+            if (device_id, field) not in await self.async_refresh_devices(
+                [(device_id, field)]
+            ):
+                raise first_error
+            if applied(self.data):
+                _LOGGER.debug(
+                    "Command for %s failed ambiguously (%s) but was applied",
+                    device_id,
+                    first_error,
+                )
+                return
+        _LOGGER.debug(
+            "Command for %s failed ambiguously (%s) and wasn't applied; retrying once",
+            device_id,
+            first_error,
+        )
+        await self.client.set_command(setcommands)
+
+    @staticmethod
+    def _is_settled(
+        data: SmartSlydrCoordinatorData, device_id: str, field: str, value
+    ) -> bool:
+        if field == "petpass":
+            return data.petpass_states.get(device_id) == value
+        dev = data.devices.get(device_id)
+        observed = getattr(dev, field, None) if dev is not None else None
+        if observed is None:
+            return False
+        return abs(observed - value) <= _POSITION_TOLERANCE
+
+    @callback
+    def async_expect(
+        self,
+        device_id: str,
+        field: str,
+        value=None,
+        *,
+        eta: float = 0.0,
+        midway: bool = False,
+    ) -> None:
+        """Verify that ``field`` of ``device_id`` reaches ``value``.
+
+        The first targeted read goes out ``eta`` seconds (the predicted
+        end of motion; 0 for instant changes) plus VERIFY_MARGIN_S from
+        now, then backs off per VERIFY_BACKOFF_S until the value settles.
+        With ``midway``, a long enough move is also read half way to its
+        predicted arrival (see MIDWAY_READ_MIN_S). A newer expectation
+        for the same device and field replaces the older one.
+        """
+        now = self.hass.loop.time()
+        due = now + max(eta, 0.0) + VERIFY_MARGIN_S
+        exp = _Expectation(value, due)
+        if midway and eta / 2 >= MIDWAY_READ_MIN_S:
+            exp.due, exp.arrive_at = now + eta / 2, due
+        self._expectations[(device_id, field)] = exp
+        self._schedule_verification()
+
+    @callback
+    def _schedule_verification(self) -> None:
+        self._cancel_verify_timer()
+        if not self._expectations:
+            return
+        due = min(exp.due for exp in self._expectations.values())
+        self._verify_unsub = async_call_later(
+            self.hass, max(due - self.hass.loop.time(), 0.0), self._async_verify_due
+        )
+
+    @callback
+    def _schedule_repoll(self) -> None:
+        if self._repoll_unsub is None:
+            self._repoll_unsub = async_call_later(
+                self.hass, _POLL_DEFER_S, self._async_repoll
+            )
+
+    @callback
+    def _cancel_repoll(self) -> None:
+        if self._repoll_unsub is not None:
+            self._repoll_unsub()
+            self._repoll_unsub = None
+
+    @callback
+    def _async_repoll(self, _now) -> None:
+        self._repoll_unsub = None
+        self.hass.async_create_task(self.async_refresh())
+
+    @callback
+    def _cancel_verify_timer(self) -> None:
+        if self._verify_unsub is not None:
+            self._verify_unsub()
+            self._verify_unsub = None
+
+    @callback
+    def _async_verify_due(self, _now) -> None:
+        self._verify_unsub = None
+        if self._verify_task is not None and not self._verify_task.done():
+            # The previous read is still in flight; it reschedules when
+            # it finishes. Stacking reads only adds load on a backend
+            # that's already slow.
+            return
+        if not self._expectations:
+            return
+        # The timer was armed for the earliest due time, so that group
+        # is due now. Batch anything due shortly after into one request.
+        earliest = min(exp.due for exp in self._expectations.values())
+        due = [
+            (key, exp)
+            for key, exp in self._expectations.items()
+            if exp.due <= earliest + _VERIFY_BATCH_WINDOW_S
+        ]
+        self._verify_task = self.hass.async_create_task(self._async_verify(due))
+
+    async def _async_verify(self, due: list) -> None:
+        await self.async_refresh_devices(key for key, _exp in due)
+        now = self.hass.loop.time()
+        for key, exp in due:
+            if self._expectations.get(key) is not exp:
+                # Settled by the read above, or replaced by a newer command.
+                continue
+            if exp.value is None:
+                del self._expectations[key]
+                continue
+            if exp.arrive_at is not None:
+                # That was the mid-move read; on to the arrival one.
+                exp.due, exp.arrive_at = max(exp.arrive_at, now), None
+                continue
+            if exp.attempt >= len(VERIFY_BACKOFF_S):
+                _LOGGER.debug(
+                    "%s %s never reached %r; leaving it to the regular poll",
+                    key[0],
+                    key[1],
+                    exp.value,
+                )
+                del self._expectations[key]
+                continue
+            # While polls are backed off, follow-up reads stretch by the
+            # same factor rather than keep their normal cadence.
+            stretch = self.update_interval / self._default_interval
+            exp.due = now + VERIFY_BACKOFF_S[exp.attempt] * max(stretch, 1.0)
+            exp.attempt += 1
+        self._schedule_verification()
+
+    @callback
+    def async_cancel_verification(self) -> None:
+        """Drop every pending expectation and cancel the verify timer.
+
+        Also cancels a deferred poll, so nothing fires after unload.
+        """
+        self._expectations.clear()
+        self._cancel_verify_timer()
+        self._cancel_repoll()
@@ -4,22 +4,30 @@ import asyncio
 import logging
 import time
 
+import aiohttp
+
 from homeassistant.components.cover import (
     CoverDeviceClass,
     CoverEntity,
     CoverEntityFeature,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .api_client import SmartSlydrApiClient, SmartSlydrApiError
 from .const import (
-    CALIBRATED_DURATION_OPTION_PREFIX,
+    CONF_MOTION_MODE,
+    DEFAULT_MOTION_MODE,
     DEFAULT_MOVE_DURATION,
     DOMAIN,
+    MOTION_MODE_ATTRIBUTES,
     MOVE_DURATION_OPTION_PREFIX,
 )
-from .helpers import iter_devices
+from .helpers import SmartSlydrDevice, get_device, iter_devices
+from .motion import async_get_motion_scheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,34 +36,49 @@ COMMAND_POSITION = "position"
 # 0..100 are real position percentages, 200 is documented as the stop op.
 STOP_VALUE = 200
 
-# Debounce window for set-position commands. Without this, an upstream bridge
-# (e.g. Home Bridge mirroring HA state) can fan out a single user action into
-# multiple rapid set_command calls that confuse the device.
+# Minimum spacing between set-position commands to one door. Without it,
+# an upstream bridge (e.g. Home Bridge mirroring HA state) or a dragged
+# slider fans a single user action out into rapid set_command calls that
+# confuse the device. The first command goes out at once; anything newer
+# within the window is held and only the latest is sent when it closes.
 SET_POSITION_DEBOUNCE_S = 2.0
 
-# How often the local interpolation timer ticks while a move is in flight.
-# Fast enough that Lovelace's cover-card animation is smooth; slow enough
-# not to flood HA's event bus.
-_TICK_INTERVAL = 0.5
-
 # When the polled position drifts from the interpolated estimate by more
 # than this many percentage points, we cancel the animation and snap to
 # truth. Catches motor jams, manual overrides, and bad calibration.
 _RECONCILE_DRIFT = 10
 
+# A read within this many points of the target counts as arrived.
+_ARRIVAL_TOLERANCE = 2
+
+# Widest gap (seconds) between the last "not there yet" read and the
+# arrival read for which the midpoint is still a usable arrival time.
+_MAX_ARRIVAL_BRACKET_S = 4.0
+
+# Device fields the cover renders.
+_WATCHED_FIELDS = ("position",)
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up SmartSlydr covers (doors/blinds) from config entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     client: SmartSlydrApiClient = data["client"]
     coordinator = data["coordinator"]
+    calibration = data["calibration"]
+    motion = async_get_motion_scheduler(hass)
+
+    @callback
+    def _async_add_devices(devices) -> None:
+        async_add_entities(
+            SmartSlydrCover(dev, client, coordinator, motion, calibration)
+            for dev in devices
+            if dev.position is not None
+        )
 
-    entities = [
-        SmartSlydrCover(dev, client, coordinator)
-        for dev in iter_devices(coordinator.data)
-        if "position" in dev
-    ]
-    async_add_entities(entities)
+    _async_add_devices(iter_devices(coordinator.data))
+    # Doors added to the account later get entities on the poll that
+    # first sees them.
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
 
 
 class SmartSlydrCover(CoordinatorEntity, CoverEntity):
@@ -75,17 +98,29 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
         | CoverEntityFeature.SET_POSITION
     )
 
-    def __init__(self, device, client, coordinator):
+    def __init__(
+        self, device: SmartSlydrDevice, client, coordinator, motion, calibration
+    ):
         super().__init__(coordinator)
-        self._device_id = device["device_id"]
-        self._device_name = device.get("devicename", self._device_id)
+        self._device_id = device.device_id
+        self._device_name = device.name
         self._client = client
+        self._motion = motion
+        self._calibration = calibration
         self._last_set_position_at: float = 0.0
-        self._move_task: asyncio.Task | None = None
-        # Tracks an in-flight calibration attempt. Populated only on
-        # full-range moves (0->100 or 100->0); cleared on success,
-        # interruption, or timeout.
-        self._calibration_pending: dict | None = None
+        # Latest set-position request held back by the debounce window,
+        # and the timer that sends it when the window closes.
+        self._queued_position: int | None = None
+        self._queue_unsub = None
+        # Target of the last position command actually sent; None after
+        # a stop.
+        self._sent_position: int | None = None
+        # Timing of an in-flight move being sampled for the motion
+        # model; cleared on arrival, interruption, or timeout.
+        self._move_sample: dict | None = None
+        # Move metadata published as attributes in MOTION_MODE_ATTRIBUTES;
+        # None when no move is in flight (or in tick mode).
+        self._motion_attrs: dict | None = None
 
         # Suffix the unique_id so it doesn't collide with the device-
         # registry identifier and leaves room for future per-device
@@ -93,11 +128,8 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
         # the bare device_id; async_migrate_entry rewrites them.
         self._attr_unique_id = f"{self._device_id}_cover"
 
-    def _device_data(self) -> dict:
-        for dev in iter_devices(self.coordinator.data):
-            if dev.get("device_id") == self._device_id:
-                return dev
-        return {}
+    def _device_data(self) -> SmartSlydrDevice | None:
+        return get_device(self.coordinator.data, self._device_id)
 
     @property
     def device_info(self):
@@ -107,6 +139,15 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
             "manufacturer": "SmartSlydr",
         }
 
+    @property
+    def assumed_state(self) -> bool:
+        # Restored from the last run's snapshot, not yet confirmed by a poll.
+        return self.coordinator.restored
+
+    @property
+    def extra_state_attributes(self):
+        return self._motion_attrs
+
     @property
     def current_cover_position(self) -> int:
         # _attr_current_cover_position takes precedence when set as an
@@ -114,7 +155,7 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
         # fall through to the last polled value otherwise.
         if "_attr_current_cover_position" in self.__dict__:
             return self.__dict__["_attr_current_cover_position"]
-        return int(self._device_data().get("position", 0) or 0)
+        return self._polled_position()
 
     @property
     def is_closed(self) -> bool:
@@ -122,121 +163,209 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
 
     def _polled_position(self) -> int:
         """Return the position from the last coordinator poll, ignoring overrides."""
-        return int(self._device_data().get("position", 0) or 0)
+        dev = self._device_data()
+        return (dev.position or 0) if dev is not None else 0
 
-    def _move_duration_seconds(self) -> float:
-        """Resolve the move duration: manual override > calibrated > default."""
+    def _duration_override(self) -> float | None:
         entry = self.coordinator.config_entry
         options = entry.options if entry is not None else {}
-        override = options.get(f"{MOVE_DURATION_OPTION_PREFIX}{self._device_id}")
-        if override:
+        value = options.get(f"{MOVE_DURATION_OPTION_PREFIX}{self._device_id}")
+        if value:
             try:
-                return max(1.0, float(override))
+                return max(1.0, float(value))
             except (TypeError, ValueError):
                 pass
-        calibrated = options.get(
-            f"{CALIBRATED_DURATION_OPTION_PREFIX}{self._device_id}"
+        return None
+
+    def _move_duration_seconds(self) -> float:
+        """Resolve the full-traversal duration: manual override > calibrated > default."""
+        duration = self._duration_override()
+        if duration is None:
+            duration = self._calibration.duration(self._device_id)
+        return duration if duration is not None else DEFAULT_MOVE_DURATION
+
+    def _move_timing(self, start: int, target: int) -> tuple[float, float]:
+        """Predict ``(latency, travel)`` seconds for a move.
+
+        A manual override is taken literally (no latency, linear in
+        distance). Otherwise the learned motion model decides, falling
+        back to the calibrated or default full-traversal duration for
+        directions it hasn't seen.
+        """
+        distance = abs(target - start)
+        override = self._duration_override()
+        if override is not None:
+            return 0.0, override * distance / 100
+        return self._motion.model(self._device_id).predict(
+            distance, target > start, self._move_duration_seconds()
         )
-        if calibrated:
-            try:
-                return max(1.0, float(calibrated))
-            except (TypeError, ValueError):
-                pass
-        return DEFAULT_MOVE_DURATION
 
-    def _clear_optimistic_state(self) -> None:
-        """Drop optimistic overrides so the coordinator value takes over."""
+    def _uses_motion_attributes(self) -> bool:
+        entry = self.coordinator.config_entry
+        options = entry.options if entry is not None else {}
+        return (
+            options.get(CONF_MOTION_MODE, DEFAULT_MOTION_MODE)
+            == MOTION_MODE_ATTRIBUTES
+        )
+
+    def _clear_optimistic_state(self) -> bool:
+        """Drop optimistic overrides so the coordinator value takes over.
+
+        Returns True if any override was present (the rendered state may
+        have changed even though the polled value didn't).
+        """
+        cleared = self._motion_attrs is not None
+        self._motion_attrs = None
         for attr in (
             "_attr_current_cover_position",
             "_attr_is_opening",
             "_attr_is_closing",
         ):
-            self.__dict__.pop(attr, None)
+            if self.__dict__.pop(attr, None) is not None:
+                cleared = True
+        return cleared
+
+    def _is_moving(self) -> bool:
+        return self._motion.is_moving(self._attr_unique_id)
 
-    def _cancel_move_task(self) -> None:
-        if self._move_task and not self._move_task.done():
-            self._move_task.cancel()
+    def _cancel_move(self) -> None:
+        self._motion.async_cancel(self._attr_unique_id)
 
-    async def _animate_to(
-        self, start: int, target: int, duration: float
+    @callback
+    def _animate_to(
+        self, start: int, target: int, latency: float, travel: float
     ) -> None:
-        """Locally interpolate position over `duration` seconds.
+        """Locally interpolate position along the predicted motion.
+
+        Holds at `start` for the startup `latency`, then moves linearly
+        over `travel` seconds.
 
         Lovelace's cover card animates smoothly when current_cover_position
-        ticks across intermediate values. Real state lands on the next
-        coordinator poll (fast-poll mode for ~30s after the command); if
-        it diverges, _handle_coordinator_update cancels this task.
+        ticks across intermediate values. The shared motion scheduler
+        drives the ticks; real state lands on the verification read the
+        coordinator schedules for the predicted arrival (or the next
+        regular poll), and if it diverges _handle_coordinator_update
+        cancels the move.
+
+        In MOTION_MODE_ATTRIBUTES the scheduler only tracks the timeline
+        (for drift checks and completion); nothing is written until the
+        move ends.
         """
-        loop_time = self.hass.loop.time
-        t0 = loop_time()
-        try:
-            while True:
-                elapsed = loop_time() - t0
-                if elapsed >= duration:
-                    break
-                progress = elapsed / duration
-                current = round(start + (target - start) * progress)
-                self._attr_current_cover_position = current
-                self.async_write_ha_state()
-                await asyncio.sleep(_TICK_INTERVAL)
-            # Normal completion - snap to target and stop signaling motion.
-            self._attr_current_cover_position = target
-            self._attr_is_opening = False
-            self._attr_is_closing = False
-            self.async_write_ha_state()
-        except asyncio.CancelledError:
-            # Stop, superseding command, or entity teardown. Leave the
-            # last interpolated value in place; the next poll reconciles.
-            self._attr_is_opening = False
-            self._attr_is_closing = False
-            self.async_write_ha_state()
-            raise
+        self._motion.async_start(
+            self._attr_unique_id,
+            start,
+            target,
+            latency + travel,
+            self._on_motion_position,
+            self._on_motion_done,
+            interpolate=self._motion_attrs is None,
+            latency=latency,
+        )
+
+    @callback
+    def _on_motion_position(self, position: int) -> None:
+        self._attr_current_cover_position = position
+        self.async_write_ha_state()
 
-    def _start_calibration_if_full_traversal(
-        self, start: int, target: int
+    @callback
+    def _on_motion_done(self, position: int | None) -> None:
+        # position is the target on normal completion - snap to it. On
+        # cancellation (stop, superseding command, entity teardown) it's
+        # None: leave the last interpolated value in place; the next
+        # poll reconciles. Either way, stop signaling motion.
+        if position is not None:
+            self._attr_current_cover_position = position
+        self._attr_is_opening = False
+        self._attr_is_closing = False
+        self._motion_attrs = None
+        self.async_write_ha_state()
+
+    def _start_sample(
+        self, start: int, target: int, latency: float, travel: float
     ) -> None:
-        """Begin tracking a calibration attempt for a 0->100 / 100->0 move."""
-        if (start, target) not in ((0, 100), (100, 0)):
-            self._calibration_pending = None
-            return
-        duration = self._move_duration_seconds()
-        self._calibration_pending = {
+        """Begin timing a move for the motion model.
+
+        Called once the command has been accepted, only when the start
+        is confirmed: the door wasn't already moving and the last read
+        agrees with where the move begins. Anything else would time a
+        move from the wrong origin.
+        """
+        now = self.hass.loop.time()
+        self._move_sample = {
             "start": start,
             "target": target,
-            "t_start": time.monotonic(),
-            "expires_at": time.monotonic() + duration * 3.0,
+            "t_start": now,
+            # Latest time the door was known not to have arrived.
+            "last_miss": now,
+            # Move took >3x the full-traversal duration - likely jammed
+            # or never reached target. Stop waiting for it.
+            "expires_at": now + 3.0 * max(
+                self._move_duration_seconds(), latency + travel
+            ),
         }
 
-    def _check_calibration(self) -> None:
-        """Settle a pending calibration if the polled position has reached the target."""
-        cal = self._calibration_pending
-        if not cal:
+    def _observe_move(self) -> None:
+        """Feed a fresh position read for the tracked move to the motion model.
+
+        An intermediate position is an exact sample (that many points
+        covered by now). Arrival is only known to have happened between
+        the last read that hadn't arrived and this one, so it's sampled
+        at the midpoint - and only when that bracket is tight enough to
+        mean something; a read long after the fact is just an upper
+        bound and would bias the model slow. The exception is a door
+        that arrived before even the first read and sooner than the
+        model predicted: there the upper bound is the only sign that it
+        is fast, and it still pulls the model the right way.
+        """
+        pending = self._move_sample
+        if not pending:
             return
-        now = time.monotonic()
-        if now > cal["expires_at"]:
-            # Move took >3x the expected duration - likely jammed or never
-            # reached target. Discard the sample.
+        read_at = self.coordinator.position_read_at(self._device_id)
+        if read_at is None or read_at <= pending["last_miss"]:
+            return  # no new read for this door
+        if read_at > pending["expires_at"]:
             _LOGGER.debug(
-                "Calibration aborted for %s: target %d not reached within %.1fs",
+                "Motion sample dropped for %s: target %d not reached in time",
                 self._device_id,
-                cal["target"],
-                cal["expires_at"] - cal["t_start"],
+                pending["target"],
             )
-            self._calibration_pending = None
+            self._move_sample = None
             return
+        start, target = pending["start"], pending["target"]
+        opening = target > start
         polled = self._polled_position()
-        if abs(polled - cal["target"]) <= 2:
-            observed = now - cal["t_start"]
-            self._calibration_pending = None
-            self._persist_calibration(observed)
+        model = self._motion.model(self._device_id)
+        if abs(polled - target) <= _ARRIVAL_TOLERANCE:
+            self._move_sample = None
+            distance = abs(target - start)
+            if read_at - pending["last_miss"] <= _MAX_ARRIVAL_BRACKET_S:
+                arrived = (pending["last_miss"] + read_at) / 2
+                self._add_sample(distance, arrived - pending["t_start"], opening)
+            elif pending["last_miss"] == pending["t_start"]:
+                elapsed = read_at - pending["t_start"]
+                if elapsed < sum(
+                    model.predict(distance, opening, self._move_duration_seconds())
+                ):
+                    self._add_sample(distance, elapsed, opening)
+            if (start, target) in ((0, 100), (100, 0)) and model.samples:
+                latency, travel = model.predict(
+                    100, opening, self._move_duration_seconds()
+                )
+                self._persist_calibration(latency + travel)
+            return
+        covered = polled - start if opening else start - polled
+        self._add_sample(covered, read_at - pending["t_start"], opening)
+        pending["last_miss"] = read_at
+
+    def _add_sample(self, distance: float, elapsed: float, opening: bool) -> None:
+        model = self._motion.model(self._device_id)
+        if model.add_sample(distance, elapsed, opening):
+            self._calibration.async_set_samples(self._device_id, model.samples)
 
     def _persist_calibration(self, duration: float) -> None:
-        entry = self.coordinator.config_entry
-        if entry is None:
-            return
-        key = f"{CALIBRATED_DURATION_OPTION_PREFIX}{self._device_id}"
-        new_options = {**entry.options, key: round(duration, 2)}
-        self.hass.config_entries.async_update_entry(entry, options=new_options)
+        # Goes to the calibration store, not entry options: an options
+        # update would reload the whole entry.
+        self._calibration.async_set_duration(self._device_id, duration)
         _LOGGER.info(
             "Calibrated move duration for %s: %.2fs",
             self._device_id,
@@ -244,15 +373,25 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
         )
 
     def _handle_coordinator_update(self) -> None:
-        # Settle calibration first - uses the last-polled position.
-        self._check_calibration()
+        # Motion sampling and reconciliation run on every poll, changed or
+        # not: both compare the polled value against local state that
+        # moves with time. Only the state write is skipped when neither
+        # they nor the poll changed what the cover renders.
+        #
+        # Sample motion timing first - uses the last-polled position.
+        self._observe_move()
 
         polled = self._polled_position()
+        local_changed = False
 
-        if self._move_task and not self._move_task.done():
+        if self._is_moving():
             # Animation is running. Reconcile if it has drifted from
-            # truth; otherwise let it keep ticking.
-            estimated = self.__dict__.get("_attr_current_cover_position", polled)
+            # truth; otherwise let it keep ticking. Compare against the
+            # timeline rather than the rendered position - in attributes
+            # mode the rendered position stays at the start until the end.
+            estimated = self._motion.estimate(self._attr_unique_id)
+            if estimated is None:
+                estimated = polled
             if abs(polled - estimated) > _RECONCILE_DRIFT:
                 _LOGGER.debug(
                     "Cover %s interpolation drift %d -> %d, snapping",
@@ -260,13 +399,19 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
                     estimated,
                     polled,
                 )
-                self._cancel_move_task()
+                # Cancelling reports the move done, and that writes the
+                # snapped state - the one write for this poll.
                 self._attr_current_cover_position = polled
+                self._cancel_move()
+                return
         else:
             # No animation - drop optimistic overrides; coordinator wins.
-            self._clear_optimistic_state()
+            local_changed = self._clear_optimistic_state()
 
-        super()._handle_coordinator_update()
+        if local_changed or self.coordinator.async_device_changed(
+            self._device_id, _WATCHED_FIELDS
+        ):
+            super()._handle_coordinator_update()
 
     async def async_open_cover(self, **kwargs) -> None:
         await self.async_set_cover_position(position=100)
@@ -277,71 +422,170 @@ class SmartSlydrCover(CoordinatorEntity, CoverEntity):
     async def async_stop_cover(self, **kwargs) -> None:
         # Stop intentionally bypasses SET_POSITION_DEBOUNCE_S - the
         # debounce was added to suppress duplicate set-position fan-out
-        # from upstream bridges, not to swallow user-initiated stops.
-        self._cancel_move_task()
-        self._calibration_pending = None
+        # from upstream bridges, not to delay user-initiated stops. It
+        # also discards a queued target, which would restart the door.
+        self._clear_queued_position()
+        self._sent_position = None
+        self._cancel_move()
+        self._move_sample = None
         self._attr_is_opening = False
         self._attr_is_closing = False
         self.async_write_ha_state()
+        # Stopping twice is harmless, so an ambiguous failure is
+        # retried without reading back first.
         await self._send_command(
-            [{"key": COMMAND_POSITION, "value": STOP_VALUE}]
+            [{"key": COMMAND_POSITION, "value": STOP_VALUE}], None
         )
-        self.coordinator.trigger_fast_poll()
+        # No target to wait for - one read shortly after the stop lands
+        # replaces any pending arrival check for this door.
+        self.coordinator.async_expect(self._device_id, COMMAND_POSITION)
 
     async def async_set_cover_position(self, **kwargs) -> None:
         pos = kwargs.get("position")
         if pos is None:
             return
-        now = time.monotonic()
-        if now - self._last_set_position_at < SET_POSITION_DEBOUNCE_S:
-            # Debounce hit: silently drop. Do NOT raise or write
-            # optimistic state - this is deliberate suppression, not
-            # a failure, and the API call never went out.
+        wait = self._last_set_position_at + SET_POSITION_DEBOUNCE_S - time.monotonic()
+        if wait > 0:
+            # Inside the window: hold the request, replacing any older
+            # one, and send it when the window closes. No optimistic
+            # write yet - nothing has gone out.
+            self._queued_position = pos
+            if self._queue_unsub is None:
+                self._queue_unsub = async_call_later(
+                    self.hass, wait, self._async_send_queued_position
+                )
             return
-        self._last_set_position_at = now
+        self._clear_queued_position()
+        await self._async_move_to(pos)
+
+    @callback
+    def _clear_queued_position(self) -> None:
+        self._queued_position = None
+        if self._queue_unsub is not None:
+            self._queue_unsub()
+            self._queue_unsub = None
+
+    @callback
+    def _async_send_queued_position(self, _now) -> None:
+        self._queue_unsub = None
+        pos, self._queued_position = self._queued_position, None
+        if pos is None or pos == self._sent_position:
+            # The door is already headed there.
+            return
+        self.hass.async_create_task(self._async_move_to_queued(pos))
+
+    async def _async_move_to_queued(self, pos: int) -> None:
+        # Nobody is awaiting a trailing-edge send, so a failure can only
+        # be logged (_send_command already did).
+        try:
+            await self._async_move_to(pos)
+        except HomeAssistantError:
+            pass
+
+    async def _async_move_to(self, pos: int) -> None:
+        """Send a move to ``pos`` now and start tracking it locally."""
+        self._last_set_position_at = time.monotonic()
+        self._sent_position = None
 
         # Cancel any in-flight animation - the new command supersedes it.
-        self._cancel_move_task()
+        # A door that was already moving gives no confirmed start to
+        # time the new move from.
+        was_moving = self._is_moving() or self._move_sample is not None
+        self._cancel_move()
+        self._move_sample = None
 
         # Optimistic write so Lovelace responds immediately. _animate_to
-        # then ticks the position toward `pos`; real state lands on the
-        # next (fast-poll) coordinator refresh.
+        # then ticks the position toward `pos`. In attributes mode the
+        # first write is the move metadata, once the command is accepted,
+        # and the next lands at the end. Real state lands on the
+        # verification read timed to the predicted arrival.
         start = self.current_cover_position
+        latency, travel = self._move_timing(start, pos)
         self._attr_current_cover_position = start  # baseline
         self._attr_is_opening = pos > start
         self._attr_is_closing = pos < start
-        self.async_write_ha_state()
+        motion_attributes = self._uses_motion_attributes()
+        if not motion_attributes:
+            self.async_write_ha_state()
 
-        # Track calibration if this is a full-range move.
-        self._start_calibration_if_full_traversal(start, pos)
+        def _applied(data) -> bool:
+            # At the target, or clearly on the way there.
+            dev = data.devices.get(self._device_id)
+            if dev is None or dev.position is None:
+                return False
+            if abs(dev.position - pos) <= _ARRIVAL_TOLERANCE:
+                return True
+            moved = dev.position - start
+            return abs(moved) > _ARRIVAL_TOLERANCE and (moved > 0) == (pos > start)
 
-        await self._send_command(
-            [{"key": COMMAND_POSITION, "value": pos}]
-        )
+        try:
+            await self._send_command(
+                [{"key": COMMAND_POSITION, "value": pos}], _applied
+            )
+        except HomeAssistantError:
+            # Nothing started moving as far as we know; don't leave the
+            # optimistic direction (or any move metadata) published.
+            self._attr_is_opening = False
+            self._attr_is_closing = False
+            self._motion_attrs = None
+            self.async_write_ha_state()
+            raise
+        self._sent_position = pos
+
+        if motion_attributes:
+            # Stamped now, not before the send: the batch window, any
+            # rate-limit wait and the round trip would all make the
+            # published start and arrival early.
+            self._motion_attrs = {
+                "motion_start_position": start,
+                "motion_target_position": pos,
+                "motion_started_at": dt_util.utcnow().isoformat(),
+                "motion_duration": round(latency + travel, 2),
+                "motion_latency": round(latency, 2),
+            }
+            self.async_write_ha_state()
 
-        duration = self._move_duration_seconds()
-        self._move_task = self.hass.async_create_task(
-            self._animate_to(start, pos, duration)
+        if (
+            not was_moving
+            and abs(self._polled_position() - start) <= _ARRIVAL_TOLERANCE
+        ):
+            self._start_sample(start, pos, latency, travel)
+        self._animate_to(start, pos, latency, travel)
+        self.coordinator.async_expect(
+            self._device_id,
+            COMMAND_POSITION,
+            pos,
+            eta=latency + travel,
+            # A timed move is also read half way, so a door that's faster
+            # than predicted gets sampled too.
+            midway=self._move_sample is not None,
         )
-        self.coordinator.trigger_fast_poll()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The model outlives entry reloads on the motion scheduler; after
+        # a restart, pick up where it left off.
+        model = self._motion.model(self._device_id)
+        if not model.samples:
+            model.restore(self._calibration.samples(self._device_id))
 
     async def async_will_remove_from_hass(self) -> None:
-        """Cancel any in-flight animation before HA tears the entity down."""
-        self._cancel_move_task()
-        if self._move_task is not None:
-            try:
-                await self._move_task
-            except (asyncio.CancelledError, Exception):
-                pass
+        """Cancel any in-flight animation or queued command before teardown."""
+        self._clear_queued_position()
+        self._cancel_move()
         await super().async_will_remove_from_hass()
 
-    async def _send_command(self, commands: list[dict]) -> None:
-        """Send a set_command for this device, surfacing failures to HA."""
+    async def _send_command(self, commands: list[dict], applied) -> None:
+        """Send a set_command for this device, surfacing failures to HA.
+
+        ``applied`` tells an ambiguous failure that took effect from one
+        that didn't; see coordinator.async_send_command.
+        """
         try:
-            await self._client.set_command(
-                [{"device_id": self._device_id, "commands": commands}]
+            await self.coordinator.async_send_command(
+                self._device_id, commands, COMMAND_POSITION, applied
             )
-        except SmartSlydrApiError as err:
+        except (SmartSlydrApiError, aiohttp.ClientError, asyncio.TimeoutError) as err:
             _LOGGER.warning(
                 "SmartSlydr set_command failed for %s: %s",
                 self._device_id,
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
@@ -11,6 +10,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
+from .helpers import snapshot_to_dict
 
 # Keys whose values get replaced with REDACTED before the JSON is shown
 # to the user. Account email and credentials are obvious; tokens are
@@ -32,14 +32,15 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return a redacted snapshot of entry + coordinator state."""
     bucket = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    client = bucket.get("client")
     coordinator = bucket.get("coordinator")
+    calibration = bucket.get("calibration")
 
+    # The persistence format rather than asdict(): it's JSON-safe (no
+    # frozensets) and is exactly what a restart would start from.
     snapshot: Any = None
     if coordinator is not None and coordinator.data is not None:
-        if is_dataclass(coordinator.data):
-            snapshot = asdict(coordinator.data)
-        else:
-            snapshot = coordinator.data
+        snapshot = snapshot_to_dict(coordinator.data)
 
     return {
         "entry": {
@@ -49,4 +50,14 @@ async def async_get_config_entry_diagnostics(
             "data": async_redact_data(dict(entry.data), TO_REDACT),
         },
         "coordinator_data": async_redact_data(snapshot or {}, TO_REDACT),
+        "restored_snapshot": coordinator.restored if coordinator is not None else None,
+        "polling": coordinator.polling_state() if coordinator is not None else {},
+        "calibration": (
+            calibration.as_dict(coordinator.data.devices)
+            if calibration is not None
+            and coordinator is not None
+            and coordinator.data is not None
+            else {}
+        ),
+        "client": client.diagnostics() if client is not None else {},
     }
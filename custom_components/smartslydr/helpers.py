@@ -4,24 +4,80 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 
-@dataclass(frozen=True)
+# /devices fields surfaced as sensor entities. Anything else the backend
+# sends is dropped at parse time - the snapshot only keeps what some
+# entity actually reads.
+TELEMETRY_FIELDS = ("temperature", "humidity", "wlansignal", "sound", "wlanmac")
+
+
+@dataclass(frozen=True, slots=True)
+class SmartSlydrTelemetry:
+    """Sensor readings for one device, as reported by ``/devices``.
+
+    Values are passed through untouched (the sensor platform hands them
+    to HA as-is); a field the device didn't report is None.
+    """
+
+    temperature: Any = None
+    humidity: Any = None
+    wlansignal: Any = None
+    sound: Any = None
+    wlanmac: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class SmartSlydrDevice:
+    """One device from ``/devices``, validated and coerced once per poll.
+
+    ``position`` is None when the device doesn't report one (no cover
+    entity is created for it); otherwise it's already an int.
+    ``allowed_pets`` holds the names from the device's petpass slot list.
+    ``reported`` is the set of optional keys (telemetry fields and
+    ``status``) present in the raw payload - the sensor platform keys
+    entity creation off it, so a field reported as null still gets an
+    entity, same as before parsing moved here.
+    """
+
+    device_id: str
+    name: str
+    room: str | None = None
+    position: int | None = None
+    status: Any = None
+    allowed_pets: tuple[str | None, ...] = ()
+    telemetry: SmartSlydrTelemetry = field(default_factory=SmartSlydrTelemetry)
+    reported: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class SmartSlydrRoom:
+    """A room from ``/devices``, holding its devices by id."""
+
+    name: str | None
+    device_ids: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
 class SmartSlydrCoordinatorData:
     """Snapshot of one coordinator update.
 
-    ``rooms`` is the raw ``room_lists`` list returned by ``/devices``;
-    individual rooms may still be malformed (a non-dict slips through),
-    which is why entity platforms iterate via ``iter_devices``.
+    ``rooms`` and ``devices`` are parsed from the ``room_lists`` payload
+    of ``/devices`` by ``parse_devices``; malformed rooms and devices
+    are dropped there, so entities never see raw JSON.
 
     ``petpass_states`` maps device_id -> on/off, sourced from a
     ``/operation/get`` call alongside the ``/devices`` poll.
+
+    ``devices`` maps device_id -> SmartSlydrDevice so entity property
+    lookups are a dict hit instead of a scan over every room and device.
     """
 
-    rooms: list = field(default_factory=list)
+    rooms: tuple[SmartSlydrRoom, ...] = ()
     petpass_states: dict[str, bool] = field(default_factory=dict)
+    devices: dict[str, SmartSlydrDevice] = field(default_factory=dict)
 
 
 _TRUTHY_STRINGS = frozenset({"true", "1", "on", "yes", "enabled"})
@@ -61,6 +117,57 @@ def coerce_petpass_bool(value) -> bool | None:
     return None
 
 
+# Per-device fields the change detector compares between snapshots.
+# Entities name the subset they render (see each platform's
+# _handle_coordinator_update); "petpass" is the on/off state from
+# /operation/get, "allowed_pets" the slot names from /devices.
+DEVICE_FIELDS = frozenset(
+    {"position", "status", "petpass", "allowed_pets", *TELEMETRY_FIELDS}
+)
+
+
+def _field_values(data: SmartSlydrCoordinatorData, dev: SmartSlydrDevice) -> dict:
+    values = {
+        "position": dev.position,
+        "status": dev.status,
+        "petpass": data.petpass_states.get(dev.device_id),
+        "allowed_pets": dev.allowed_pets,
+    }
+    for key in TELEMETRY_FIELDS:
+        values[key] = getattr(dev.telemetry, key)
+    return values
+
+
+def diff_snapshots(
+    old: SmartSlydrCoordinatorData | None,
+    new: SmartSlydrCoordinatorData,
+) -> dict[str, frozenset[str]] | None:
+    """Return device_id -> changed field names between two snapshots.
+
+    Devices whose fields are all unchanged are omitted. A device that
+    appeared or disappeared counts as every field changed. Returns None
+    (meaning "treat everything as changed") when there's no previous
+    snapshot to compare against.
+    """
+    if old is None:
+        return None
+    changes: dict[str, frozenset[str]] = {}
+    for device_id in old.devices.keys() | new.devices.keys():
+        before = old.devices.get(device_id)
+        after = new.devices.get(device_id)
+        if before is None or after is None:
+            changes[device_id] = DEVICE_FIELDS
+            continue
+        old_values = _field_values(old, before)
+        new_values = _field_values(new, after)
+        changed = frozenset(
+            key for key, value in new_values.items() if old_values[key] != value
+        )
+        if changed:
+            changes[device_id] = changed
+    return changes
+
+
 def iter_devices_in_rooms(rooms: Any) -> Iterator[dict]:
     """Yield each device dict from a room_lists payload, defensively.
 
@@ -81,15 +188,193 @@ def iter_devices_in_rooms(rooms: Any) -> Iterator[dict]:
                 yield dev
 
 
-def iter_devices(data: Any) -> Iterator[dict]:
-    """Yield each device dict from coordinator data, defensively.
+def _coerce_position(value) -> int:
+    """Coerce a /devices position to an int, treating junk as closed (0)."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_device(dev: dict, room: str | None = None) -> SmartSlydrDevice | None:
+    """Build a SmartSlydrDevice from one raw /devices entry.
+
+    Returns None for entries without a device_id - nothing could look
+    them up, and every entity keys off it.
+    """
+    device_id = dev.get("device_id")
+    if not device_id:
+        return None
+    slots = dev.get("petpass")
+    allowed_pets = (
+        tuple(slot.get("name") for slot in slots if isinstance(slot, dict))
+        if isinstance(slots, list)
+        else ()
+    )
+    return SmartSlydrDevice(
+        device_id=device_id,
+        name=dev.get("devicename", device_id),
+        room=room,
+        position=_coerce_position(dev["position"]) if "position" in dev else None,
+        status=dev.get("status"),
+        allowed_pets=allowed_pets,
+        telemetry=SmartSlydrTelemetry(
+            **{key: dev.get(key) for key in TELEMETRY_FIELDS}
+        ),
+        reported=frozenset(
+            key for key in (*TELEMETRY_FIELDS, "status") if key in dev
+        ),
+    )
+
+
+def parse_devices(
+    rooms: Any,
+) -> tuple[tuple[SmartSlydrRoom, ...], dict[str, SmartSlydrDevice]]:
+    """Parse a room_lists payload into rooms and a device_id index.
+
+    Runs once per poll; the shape checks from ``iter_devices_in_rooms``
+    happen here and nowhere else. If the backend ever lists the same
+    device twice, the first one wins, matching what the old linear
+    scan returned.
+    """
+    parsed_rooms: list[SmartSlydrRoom] = []
+    devices: dict[str, SmartSlydrDevice] = {}
+    if not isinstance(rooms, list):
+        return (), devices
+    for room in rooms:
+        if not isinstance(room, dict):
+            continue
+        room_name = room.get("room_name")
+        device_ids: list[str] = []
+        for dev in iter_devices_in_rooms([room]):
+            parsed = parse_device(dev, room_name)
+            if parsed is None or parsed.device_id in devices:
+                continue
+            devices[parsed.device_id] = parsed
+            device_ids.append(parsed.device_id)
+        parsed_rooms.append(
+            SmartSlydrRoom(name=room_name, device_ids=tuple(device_ids))
+        )
+    return tuple(parsed_rooms), devices
+
+
+def merge_statuses(
+    data: SmartSlydrCoordinatorData, statuses: Any
+) -> SmartSlydrCoordinatorData:
+    """Merge an ``/operation/get`` response into an existing snapshot.
+
+    Used by targeted refreshes that re-read a few fields instead of the
+    whole account. Understands ``position`` and ``petpass`` entries;
+    devices not already in the snapshot are ignored (the next full poll
+    picks them up), as are petpass values in an unrecognized shape.
+    """
+    devices = dict(data.devices)
+    petpass_states = dict(data.petpass_states)
+    for st in statuses or []:
+        if not isinstance(st, dict):
+            continue
+        did = st.get("device_id")
+        dev = devices.get(did)
+        if dev is None:
+            continue
+        if "position" in st and dev.position is not None:
+            devices[did] = replace(dev, position=_coerce_position(st["position"]))
+        if "petpass" in st:
+            parsed = coerce_petpass_bool(st["petpass"])
+            if parsed is not None:
+                petpass_states[did] = parsed
+    return replace(data, devices=devices, petpass_states=petpass_states)
+
+
+def get_device(data: Any, device_id: str) -> SmartSlydrDevice | None:
+    """Return the parsed device for ``device_id`` from coordinator data.
 
-    Accepts either a ``SmartSlydrCoordinatorData`` instance (the modern
-    shape) or ``None`` (during the brief window before the first
-    successful refresh). Internal call sites that already have the
-    rooms list directly should use ``iter_devices_in_rooms``.
+    O(1) via ``SmartSlydrCoordinatorData.devices``. Returns None when
+    there's no data yet or the device dropped out of the last poll.
+    """
+    if data is None:
+        return None
+    devices = getattr(data, "devices", None)
+    if not isinstance(devices, dict):
+        return None
+    return devices.get(device_id)
+
+
+def iter_devices(data: Any) -> Iterator[SmartSlydrDevice]:
+    """Yield each parsed device from coordinator data.
+
+    Accepts either a ``SmartSlydrCoordinatorData`` instance or ``None``
+    (during the brief window before the first successful refresh).
+    Code holding a raw room_lists payload should use
+    ``iter_devices_in_rooms`` or ``parse_devices`` instead.
     """
     if data is None:
         return
-    rooms = getattr(data, "rooms", None)
-    yield from iter_devices_in_rooms(rooms)
+    devices = getattr(data, "devices", None)
+    if isinstance(devices, dict):
+        yield from devices.values()
+
+
+def snapshot_to_dict(data: SmartSlydrCoordinatorData) -> dict[str, Any]:
+    """Serialize a snapshot to JSON-safe primitives for persistence."""
+    return {
+        "rooms": [
+            {"name": room.name, "device_ids": list(room.device_ids)}
+            for room in data.rooms
+        ],
+        "petpass_states": dict(data.petpass_states),
+        "devices": [
+            {
+                "device_id": dev.device_id,
+                "name": dev.name,
+                "room": dev.room,
+                "position": dev.position,
+                "status": dev.status,
+                "allowed_pets": list(dev.allowed_pets),
+                "telemetry": {f: getattr(dev.telemetry, f) for f in TELEMETRY_FIELDS},
+                "reported": sorted(dev.reported),
+            }
+            for dev in data.devices.values()
+        ],
+    }
+
+
+def snapshot_from_dict(raw: Any) -> SmartSlydrCoordinatorData | None:
+    """Rebuild a snapshot written by ``snapshot_to_dict``.
+
+    Returns None if ``raw`` isn't in that shape (a file from a future
+    version, or hand-edited); the caller then starts without one.
+    """
+    if not isinstance(raw, dict):
+        return None
+    try:
+        rooms = tuple(
+            SmartSlydrRoom(name=room["name"], device_ids=tuple(room["device_ids"]))
+            for room in raw["rooms"]
+        )
+        devices = {}
+        for dev in raw["devices"]:
+            telemetry = dev.get("telemetry") or {}
+            position = dev.get("position")
+            devices[dev["device_id"]] = SmartSlydrDevice(
+                device_id=dev["device_id"],
+                name=dev["name"],
+                room=dev.get("room"),
+                position=None if position is None else _coerce_position(position),
+                status=dev.get("status"),
+                allowed_pets=tuple(dev.get("allowed_pets") or ()),
+                telemetry=SmartSlydrTelemetry(
+                    **{f: telemetry.get(f) for f in TELEMETRY_FIELDS}
+                ),
+                reported=frozenset(dev.get("reported") or ()),
+            )
+        petpass_states = {
+            did: bool(state)
+            for did, state in raw["petpass_states"].items()
+            if did in devices
+        }
+    except (KeyError, TypeError, AttributeError):
+        return None
+    return SmartSlydrCoordinatorData(
+        rooms=rooms, petpass_states=petpass_states, devices=devices
+    )
@@ -0,0 +1,312 @@
+# config/custom_components/smartslydr/motion.py
+"""Shared local interpolation for moving SmartSlydr covers."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+# hass.data key for the integration-wide scheduler. Not per entry: one
+# timer serves every moving cover across all accounts.
+DATA_MOTION_SCHEDULER = f"{DOMAIN}_motion"
+
+# How often the shared interpolation timer ticks while any move is in
+# flight. Fast enough that Lovelace's cover-card animation is smooth;
+# slow enough not to flood HA's event bus.
+TICK_INTERVAL = 0.5
+
+# Rolling window of observed moves each device's motion model is fitted
+# over. Long enough to average out poll jitter, short enough to follow a
+# door that slows down as its track gets dirty.
+MODEL_WINDOW = 20
+
+# Moves shorter than this (percentage points) are mostly startup latency
+# and rounding noise; they don't make useful samples.
+MIN_SAMPLE_DISTANCE = 5
+
+
+@dataclass(frozen=True, slots=True)
+class MotionSample:
+    """One observation: ``distance`` points covered ``elapsed`` s after the command."""
+
+    distance: float
+    elapsed: float
+    opening: bool
+
+
+class SmartSlydrMotionModel:
+    """Per-device timing model: ``elapsed = latency + distance * pace``.
+
+    ``latency`` is the fixed delay between the command being accepted
+    and the door starting to move; ``pace`` (seconds per percentage
+    point) is fitted separately for opening and closing, since a door
+    on a slight incline isn't equally fast both ways. Fitted by least
+    squares over the last MODEL_WINDOW samples, from any move whose
+    start and end (or an intermediate position) were actually read -
+    not only full traversals.
+    """
+
+    def __init__(self) -> None:
+        self._samples: deque[MotionSample] = deque(maxlen=MODEL_WINDOW)
+        self._fit: tuple[float, float | None, float | None] | None = None
+
+    @property
+    def samples(self) -> tuple[MotionSample, ...]:
+        return tuple(self._samples)
+
+    def add_sample(self, distance: float, elapsed: float, opening: bool) -> bool:
+        """Record an observation. Returns False if it was rejected as noise."""
+        if distance < MIN_SAMPLE_DISTANCE or elapsed <= 0:
+            return False
+        self._samples.append(MotionSample(distance, elapsed, opening))
+        self._fit = None
+        return True
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._fit = None
+
+    def restore(self, samples) -> None:
+        """Replace the window with previously persisted samples."""
+        self._samples = deque(samples, maxlen=MODEL_WINDOW)
+        self._fit = None
+
+    def predict(
+        self, distance: float, opening: bool, full_duration: float
+    ) -> tuple[float, float]:
+        """Return ``(latency, travel)`` seconds for a move of ``distance`` points.
+
+        ``full_duration`` (a 0-100 traversal) is the fallback for a
+        direction the model hasn't seen yet, or for all moves when it
+        has no samples at all.
+        """
+        if self._fit is None:
+            self._fit = self._solve()
+        latency, pace_open, pace_close = self._fit
+        pace = pace_open if opening else pace_close
+        if pace is None:
+            pace = pace_close if opening else pace_open
+        if pace is None:
+            return 0.0, full_duration * distance / 100
+        return latency, pace * distance
+
+    def _solve(self) -> tuple[float, float | None, float | None]:
+        samples = self._samples
+        if not samples:
+            return 0.0, None, None
+        fit = _least_squares(samples)
+        if fit is not None:
+            latency, pace_open, pace_close = fit
+            shortest = min(s.elapsed for s in samples)
+            if 0.0 <= latency < shortest and all(
+                p is None or p > 0 for p in (pace_open, pace_close)
+            ):
+                return fit
+        # Too few distinct distances to separate latency from speed, or
+        # the fit came out non-physical: fall back to a pure rate
+        # through the origin for each direction.
+        return 0.0, _pace_through_origin(samples, True), _pace_through_origin(
+            samples, False
+        )
+
+
+def _pace_through_origin(samples, opening: bool) -> float | None:
+    num = sum(s.distance * s.elapsed for s in samples if s.opening is opening)
+    den = sum(s.distance * s.distance for s in samples if s.opening is opening)
+    return num / den if den else None
+
+
+def _least_squares(samples) -> tuple[float, float | None, float | None] | None:
+    """Fit ``elapsed = latency + pace_dir * distance`` with a shared latency.
+
+    Returns None when the system is underdetermined (e.g. every sample
+    covered the same distance). A direction with no samples gets None
+    for its pace.
+    """
+    directions = [d for d in (True, False) if any(s.opening is d for s in samples)]
+    if len(samples) <= len(directions):
+        return None
+    # Columns: [1, distance if opening, distance if closing] for the
+    # directions present. Build and solve the normal equations.
+    rows = [
+        [1.0] + [s.distance if s.opening is d else 0.0 for d in directions]
+        for s in samples
+    ]
+    n = len(rows[0])
+    ata = [[sum(r[i] * r[j] for r in rows) for j in range(n)] for i in range(n)]
+    atb = [sum(r[i] * s.elapsed for r, s in zip(rows, samples)) for i in range(n)]
+    solution = _solve_linear(ata, atb)
+    if solution is None:
+        return None
+    paces = dict(zip(directions, solution[1:]))
+    return solution[0], paces.get(True), paces.get(False)
+
+
+def _solve_linear(matrix: list[list[float]], vector: list[float]) -> list[float] | None:
+    """Gaussian elimination with partial pivoting; None if singular."""
+    n = len(vector)
+    aug = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(aug[r][col]))
+        if abs(aug[pivot][col]) < 1e-9:
+            return None
+        aug[col], aug[pivot] = aug[pivot], aug[col]
+        for r in range(n):
+            if r != col:
+                factor = aug[r][col] / aug[col][col]
+                for c in range(col, n + 1):
+                    aug[r][c] -= factor * aug[col][c]
+    return [aug[i][n] / aug[i][i] for i in range(n)]
+
+
+@dataclass(slots=True)
+class _Motion:
+    start: int
+    target: int
+    duration: float
+    t0: float
+    position: int
+    on_position: Callable[[int], None]
+    on_done: Callable[[int | None], None]
+    interpolate: bool = True
+    # Leading part of ``duration`` spent waiting for the door to start;
+    # the position holds at ``start`` until it has passed.
+    latency: float = 0.0
+
+    def estimate(self, now: float) -> int:
+        travel = self.duration - self.latency
+        if travel <= 0:
+            return self.target if now - self.t0 >= self.duration else self.start
+        progress = min(max((now - self.t0 - self.latency) / travel, 0.0), 1.0)
+        return round(self.start + (self.target - self.start) * progress)
+
+
+class SmartSlydrMotionScheduler:
+    """Owns every in-flight cover interpolation and ticks them together.
+
+    A scene that closes eight doors used to start eight independent
+    0.5s timers, each writing state on every tick whether or not the
+    rounded position moved. Here one timer runs while anything is
+    moving, ``on_position`` fires only when a cover's integer position
+    changes, and the timer stops as soon as the last move finishes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._motions: dict[str, _Motion] = {}
+        self._unsub: Callable[[], None] | None = None
+        # device_id -> learned timing. Lives here rather than on the
+        # entity so it survives an entry reload.
+        self._models: dict[str, SmartSlydrMotionModel] = {}
+
+    def model(self, device_id: str) -> SmartSlydrMotionModel:
+        """Return the motion model for ``device_id``, creating it on first use."""
+        model = self._models.get(device_id)
+        if model is None:
+            model = self._models[device_id] = SmartSlydrMotionModel()
+        return model
+
+    def is_moving(self, key: str) -> bool:
+        return key in self._motions
+
+    def estimate(self, key: str) -> int | None:
+        """Return where ``key`` should be right now, or None if it isn't moving.
+
+        Works for both modes - a non-interpolated move still has a
+        timeline, it just isn't published tick by tick.
+        """
+        motion = self._motions.get(key)
+        if motion is None:
+            return None
+        return motion.estimate(self.hass.loop.time())
+
+    @callback
+    def async_start(
+        self,
+        key: str,
+        start: int,
+        target: int,
+        duration: float,
+        on_position: Callable[[int], None],
+        on_done: Callable[[int | None], None],
+        *,
+        interpolate: bool = True,
+        latency: float = 0.0,
+    ) -> None:
+        """Interpolate ``key`` from ``start`` to ``target`` over ``duration``.
+
+        ``on_position`` gets each new integer position. ``on_done`` gets
+        the target when the move completes, or None if it was cancelled
+        (stop, superseding command, drift snap, or teardown). A move
+        already running for ``key`` is cancelled first. With
+        ``interpolate`` False, ``on_position`` is never called; the move
+        only tracks its timeline and completes on schedule. The first
+        ``latency`` seconds of ``duration`` hold at ``start``.
+        """
+        self.async_cancel(key)
+        self._motions[key] = _Motion(
+            start=start,
+            target=target,
+            duration=max(duration, 0.0),
+            t0=self.hass.loop.time(),
+            position=start,
+            on_position=on_position,
+            on_done=on_done,
+            interpolate=interpolate,
+            latency=min(max(latency, 0.0), max(duration, 0.0)),
+        )
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=TICK_INTERVAL)
+            )
+
+    @callback
+    def async_cancel(self, key: str) -> bool:
+        """Cancel the move for ``key``. Returns True if one was running."""
+        motion = self._motions.pop(key, None)
+        if motion is None:
+            return False
+        self._stop_timer_if_idle()
+        motion.on_done(None)
+        return True
+
+    @callback
+    def _async_tick(self, _now=None) -> None:
+        now = self.hass.loop.time()
+        for key, motion in list(self._motions.items()):
+            if self._motions.get(key) is not motion:
+                # Cancelled or replaced by a callback earlier in this tick.
+                continue
+            if now - motion.t0 >= motion.duration:
+                del self._motions[key]
+                motion.on_done(motion.target)
+                continue
+            if not motion.interpolate:
+                continue
+            position = motion.estimate(now)
+            if position != motion.position:
+                motion.position = position
+                motion.on_position(position)
+        self._stop_timer_if_idle()
+
+    @callback
+    def _stop_timer_if_idle(self) -> None:
+        if not self._motions and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+
+@callback
+def async_get_motion_scheduler(hass: HomeAssistant) -> SmartSlydrMotionScheduler:
+    """Return the integration-wide motion scheduler, creating it on first use."""
+    scheduler = hass.data.get(DATA_MOTION_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_MOTION_SCHEDULER] = SmartSlydrMotionScheduler(hass)
+    return scheduler
@@ -23,15 +23,16 @@ class _UpstreamFixFlow(RepairsFlow):
       confirm-and-retry. Clicking Submit triggers a coordinator
       refresh on each entry; if the next poll succeeds, the
       _async_update_data success path calls async_delete_issue and
-      the card clears.
+      the card clears. If the client's circuit breaker is open, the
+      retry is its single half-open probe rather than a full burst.
 
     - If at least one entry has a non-default base_url (often the
       cause of "unreachable" repairs after a misconfiguration), the
       form additionally offers a "Reset to default URL" toggle. With
       that selected, the flow strips CONF_BASE_URL from each entry's
       options; the options-update listener registered in
-      ``async_setup_entry`` then reloads the entry against the
-      default URL.
+      ``async_setup_entry`` then points the running client at the
+      default URL and polls it.
 
     Submit (vs the always-available Ignore button) does NOT mark the
     issue dismissed-by-version, so if the underlying problem comes
@@ -75,8 +76,8 @@ class _UpstreamFixFlow(RepairsFlow):
                     self.hass.config_entries.async_update_entry(
                         entry, options=new_options
                     )
-                    # The options-update listener triggers a reload,
-                    # which re-runs first-refresh against the default URL.
+                    # The options-update listener switches the client
+                    # to the default URL and refreshes against it.
             else:
                 await self._refresh_all()
             return self.async_create_entry(title="", data={})
@@ -103,6 +104,12 @@ class _UpstreamFixFlow(RepairsFlow):
             bucket = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
             if not bucket:
                 continue
+            client = bucket.get("client")
+            if client is not None:
+                # Don't wait out the rest of an open circuit's cooldown
+                # - the user asked to retry now. Everything else stays
+                # failing fast until that one probe succeeds.
+                client.request_probe()
             coordinator = bucket.get("coordinator")
             if coordinator is not None:
                 # async_refresh blocks until the poll completes, so the
@@ -3,10 +3,11 @@
 import logging
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .helpers import iter_devices
+from .helpers import SmartSlydrDevice, get_device, iter_devices
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,29 +28,47 @@ async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
 
-    entities = []
-    for dev in iter_devices(coordinator.data):
-        for cmd in _SENSOR_CONFIG:
-            if cmd in dev:
-                entities.append(SmartSlydrSensor(dev, coordinator, cmd))
-        if "status" in dev:
-            entities.append(SmartSlydrStatusSensor(dev, coordinator))
-    async_add_entities(entities)
+    @callback
+    def _async_add_devices(devices) -> None:
+        entities = []
+        for dev in devices:
+            for cmd in _SENSOR_CONFIG:
+                if cmd in dev.reported:
+                    entities.append(SmartSlydrSensor(dev, coordinator, cmd))
+            if "status" in dev.reported:
+                entities.append(SmartSlydrStatusSensor(dev, coordinator))
+        async_add_entities(entities)
+
+    _async_add_devices(iter_devices(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
 
 
 class _SmartSlydrSensorBase(CoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
+    # Device fields this entity renders; set per instance by subclasses.
+    _watched_fields: tuple[str, ...] = ()
 
-    def __init__(self, device, coordinator):
+    def __init__(self, device: SmartSlydrDevice, coordinator):
         super().__init__(coordinator)
-        self._device_id = device["device_id"]
-        self._device_name = device.get("devicename", self._device_id)
+        self._device_id = device.device_id
+        self._device_name = device.name
+
+    def _device_data(self) -> SmartSlydrDevice | None:
+        return get_device(self.coordinator.data, self._device_id)
 
-    def _device_data(self) -> dict:
-        for dev in iter_devices(self.coordinator.data):
-            if dev.get("device_id") == self._device_id:
-                return dev
-        return {}
+    def _handle_coordinator_update(self) -> None:
+        # Most polls leave sensor readings untouched; skip the state
+        # write (and the recorder / state_changed work behind it) unless
+        # the field this sensor shows actually moved.
+        if self.coordinator.async_device_changed(
+            self._device_id, self._watched_fields
+        ):
+            super()._handle_coordinator_update()
+
+    @property
+    def assumed_state(self) -> bool:
+        # Restored from the last run's snapshot, not yet confirmed by a poll.
+        return self.coordinator.restored
 
     @property
     def device_info(self):
@@ -66,6 +85,7 @@ class SmartSlydrSensor(_SmartSlydrSensorBase):
     def __init__(self, device, coordinator, sensor_type):
         super().__init__(device, coordinator)
         self._sensor_type = sensor_type
+        self._watched_fields = (sensor_type,)
 
         cfg = _SENSOR_CONFIG[sensor_type]
         if cfg["device_class"]:
@@ -78,7 +98,8 @@ class SmartSlydrSensor(_SmartSlydrSensorBase):
 
     @property
     def native_value(self):
-        return self._device_data().get(self._sensor_type)
+        dev = self._device_data()
+        return getattr(dev.telemetry, self._sensor_type) if dev is not None else None
 
 
 class SmartSlydrStatusSensor(_SmartSlydrSensorBase):
@@ -87,8 +108,10 @@ class SmartSlydrStatusSensor(_SmartSlydrSensorBase):
     def __init__(self, device, coordinator):
         super().__init__(device, coordinator)
         self._attr_name = "Status"
+        self._watched_fields = ("status",)
         self._attr_unique_id = f"{self._device_id}_status"
 
     @property
     def native_value(self):
-        return self._device_data().get("status")
+        dev = self._device_data()
+        return dev.status if dev is not None else None
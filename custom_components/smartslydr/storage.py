@@ -0,0 +1,227 @@
+# config/custom_components/smartslydr/storage.py
+"""Persistent storage: cover calibration, auth tokens and the last-known snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .helpers import SmartSlydrCoordinatorData, snapshot_from_dict, snapshot_to_dict
+from .motion import MotionSample
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.calibration"
+
+# hass.data key for the integration-wide store. Device ids are unique
+# across accounts, so one file serves every entry.
+DATA_CALIBRATION = f"{DOMAIN}_calibration"
+
+# Learned values trickle in one move at a time; batch them into one
+# disk write instead of rewriting the file per sample.
+SAVE_DELAY = 10
+
+TOKEN_STORAGE_VERSION = 1
+TOKEN_STORAGE_KEY = f"{DOMAIN}.tokens"
+DATA_TOKENS = f"{DOMAIN}_tokens"
+
+# Tokens change at most every half hour; save soon after so a crash
+# right after a renewal doesn't cost an /auth on the next start.
+TOKEN_SAVE_DELAY = 1
+
+SNAPSHOT_STORAGE_VERSION = 1
+
+# The snapshot is replaced every poll; it only has to be roughly current
+# at the next boot, so coalesce writes generously.
+SNAPSHOT_SAVE_DELAY = 60
+
+
+class SmartSlydrCalibrationStore:
+    """Learned move timing per device, kept out of the config entry.
+
+    Writing it to entry options fired the options-update listener and
+    reloaded the whole entry every time a door learned a number. Here
+    updates apply in memory immediately and reach disk on a debounced
+    save.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load from disk once; later calls are no-ops."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load()
+            if isinstance(stored, dict) and isinstance(stored.get("devices"), dict):
+                self._devices = {
+                    did: dict(entry)
+                    for did, entry in stored["devices"].items()
+                    if isinstance(entry, dict)
+                }
+            self._loaded = True
+
+    def duration(self, device_id: str) -> float | None:
+        """Return the calibrated full-traversal duration, if one was learned."""
+        value = self._devices.get(device_id, {}).get("duration")
+        try:
+            return max(1.0, float(value)) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    def samples(self, device_id: str) -> list[MotionSample]:
+        """Return the persisted motion-model samples for ``device_id``."""
+        samples = []
+        for raw in self._devices.get(device_id, {}).get("samples", ()):
+            try:
+                distance, elapsed, opening = raw
+                samples.append(MotionSample(float(distance), float(elapsed), bool(opening)))
+            except (TypeError, ValueError):
+                continue
+        return samples
+
+    @callback
+    def async_set_duration(self, device_id: str, duration: float) -> None:
+        self._devices.setdefault(device_id, {})["duration"] = round(duration, 2)
+        self._schedule_save()
+
+    @callback
+    def async_set_samples(self, device_id: str, samples) -> None:
+        self._devices.setdefault(device_id, {})["samples"] = [
+            [s.distance, round(s.elapsed, 2), s.opening] for s in samples
+        ]
+        self._schedule_save()
+
+    @callback
+    def async_clear(self, device_id: str) -> bool:
+        """Forget everything learned for ``device_id``. Returns True if anything was."""
+        if self._devices.pop(device_id, None) is None:
+            return False
+        self._schedule_save()
+        return True
+
+    @callback
+    def as_dict(self, device_ids) -> dict[str, Any]:
+        """Return the stored entries for ``device_ids`` (for diagnostics)."""
+        return {did: self._devices[did] for did in device_ids if did in self._devices}
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"devices": self._devices}
+
+
+class SmartSlydrTokenStore:
+    """Auth tokens per account and endpoint, shared by setup and the config flow.
+
+    Lets a restart, reload or freshly finished config flow go straight
+    to /devices with a token that's still valid instead of starting with
+    /auth. Written as a private file (owner-only permissions), the same
+    protection the entry's stored password gets.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, TOKEN_STORAGE_VERSION, TOKEN_STORAGE_KEY, private=True
+        )
+        self._tokens: dict[str, dict[str, Any]] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    @staticmethod
+    def _key(username: str, base_url: str) -> str:
+        # A token is only valid for the account and deployment that
+        # issued it.
+        return f"{username.lower()}|{base_url.rstrip('/')}"
+
+    async def async_load(self) -> None:
+        """Load from disk once; later calls are no-ops."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load()
+            if isinstance(stored, dict) and isinstance(stored.get("tokens"), dict):
+                self._tokens = stored["tokens"]
+            self._loaded = True
+
+    def get(self, username: str, base_url: str) -> dict[str, Any] | None:
+        return self._tokens.get(self._key(username, base_url))
+
+    @callback
+    def async_set(self, username: str, base_url: str, state: dict | None) -> None:
+        key = self._key(username, base_url)
+        if state is None:
+            if self._tokens.pop(key, None) is None:
+                return
+        else:
+            self._tokens[key] = state
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    @callback
+    def async_remove_account(self, username: str) -> None:
+        prefix = f"{username.lower()}|"
+        for key in [k for k in self._tokens if k.startswith(prefix)]:
+            del self._tokens[key]
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"tokens": self._tokens}
+
+
+class SmartSlydrSnapshotStore:
+    """Last good coordinator snapshot for one entry.
+
+    Restored at setup so entities come up immediately with the state
+    they had at shutdown, instead of waiting on /auth + /devices +
+    /operation/get against a possibly cold backend.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+        self._data: SmartSlydrCoordinatorData | None = None
+
+    async def async_load(self) -> SmartSlydrCoordinatorData | None:
+        return snapshot_from_dict(await self._store.async_load())
+
+    @callback
+    def async_save(self, data: SmartSlydrCoordinatorData) -> None:
+        self._data = data
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return snapshot_to_dict(self._data)
+
+
+async def _async_get_shared(hass: HomeAssistant, key: str, factory):
+    store = hass.data.get(key)
+    if store is None:
+        store = hass.data[key] = factory(hass)
+    await store.async_load()
+    return store
+
+
+async def async_get_calibration_store(hass: HomeAssistant) -> SmartSlydrCalibrationStore:
+    """Return the loaded integration-wide calibration store."""
+    return await _async_get_shared(hass, DATA_CALIBRATION, SmartSlydrCalibrationStore)
+
+
+async def async_get_token_store(hass: HomeAssistant) -> SmartSlydrTokenStore:
+    """Return the loaded integration-wide token store."""
+    return await _async_get_shared(hass, DATA_TOKENS, SmartSlydrTokenStore)
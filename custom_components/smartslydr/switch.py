@@ -1,15 +1,19 @@
 # config/custom_components/smartslydr/switch.py
 
+import asyncio
 import logging
 import time
 
+import aiohttp
+
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api_client import SmartSlydrApiClient, SmartSlydrApiError
 from .const import DOMAIN
-from .helpers import iter_devices
+from .helpers import SmartSlydrDevice, get_device, iter_devices
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +25,9 @@ _LOGGER = logging.getLogger(__name__)
 # value to actually change instead.
 _OPTIMISTIC_SAFETY_TIMEOUT_S = 120.0
 
+# Device fields the switch renders (is_on and the allowed_pets attribute).
+_WATCHED_FIELDS = ("petpass", "allowed_pets")
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up SmartSlydr pet pass switches from config entry."""
@@ -28,11 +35,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
     client: SmartSlydrApiClient = data["client"]
     coordinator = data["coordinator"]
 
-    entities = [
-        SmartSlydrPetpassSwitch(dev, client, coordinator)
-        for dev in iter_devices(coordinator.data)
-    ]
-    async_add_entities(entities)
+    @callback
+    def _async_add_devices(devices) -> None:
+        async_add_entities(
+            SmartSlydrPetpassSwitch(dev, client, coordinator) for dev in devices
+        )
+
+    _async_add_devices(iter_devices(coordinator.data))
+    entry.async_on_unload(coordinator.async_add_device_listener(_async_add_devices))
 
 
 class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
@@ -41,10 +51,10 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
     _attr_has_entity_name = True
     _attr_name = "Petpass"
 
-    def __init__(self, device, client, coordinator):
+    def __init__(self, device: SmartSlydrDevice, client, coordinator):
         super().__init__(coordinator)
-        self._device_id = device.get("device_id", "")
-        self._device_name = device.get("devicename", self._device_id)
+        self._device_id = device.device_id
+        self._device_name = device.name
         self._client = client
         # Pre-write polled value, captured at the moment of an optimistic
         # write. We hold the optimistic override until the polled value
@@ -55,11 +65,8 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
 
         self._attr_unique_id = f"{self._device_id}_petpass"
 
-    def _device_data(self) -> dict:
-        for dev in iter_devices(self.coordinator.data):
-            if dev.get("device_id") == self._device_id:
-                return dev
-        return {}
+    def _device_data(self) -> SmartSlydrDevice | None:
+        return get_device(self.coordinator.data, self._device_id)
 
     @property
     def device_info(self):
@@ -69,6 +76,11 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
             "manufacturer": "SmartSlydr",
         }
 
+    @property
+    def assumed_state(self) -> bool:
+        # Restored from the last run's snapshot, not yet confirmed by a poll.
+        return self.coordinator.restored
+
     @property
     def is_on(self) -> bool:
         if "_attr_is_on" in self.__dict__:
@@ -95,6 +107,7 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
         # the case where the write succeeded but the backend hasn't
         # propagated yet, and dropping the override flips the toggle
         # back to its pre-write state.
+        override_dropped = False
         if "_attr_is_on" in self.__dict__ and self._optimistic_baseline is not None:
             polled = self._polled_is_on()
             timed_out = (
@@ -105,13 +118,16 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
                 self.__dict__.pop("_attr_is_on", None)
                 self._optimistic_baseline = None
                 self._optimistic_until = None
-        super()._handle_coordinator_update()
+                override_dropped = True
+        if override_dropped or self.coordinator.async_device_changed(
+            self._device_id, _WATCHED_FIELDS
+        ):
+            super()._handle_coordinator_update()
 
     @property
     def extra_state_attributes(self):
-        slots = self._device_data().get("petpass") or []
-        allowed = [slot.get("name") for slot in slots if isinstance(slot, dict)]
-        return {"allowed_pets": allowed}
+        dev = self._device_data()
+        return {"allowed_pets": list(dev.allowed_pets) if dev is not None else []}
 
     async def async_turn_on(self, **kwargs):
         await self._send_petpass(1)
@@ -127,11 +143,13 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
         self._optimistic_until = time.monotonic() + _OPTIMISTIC_SAFETY_TIMEOUT_S
         self.async_write_ha_state()
         try:
-            await self._client.set_command(
-                [{"device_id": self._device_id,
-                  "commands": [{"key": "petpass", "value": value}]}]
+            await self.coordinator.async_send_command(
+                self._device_id,
+                [{"key": "petpass", "value": value}],
+                "petpass",
+                lambda data: data.petpass_states.get(self._device_id) == bool(value),
             )
-        except SmartSlydrApiError as err:
+        except (SmartSlydrApiError, aiohttp.ClientError, asyncio.TimeoutError) as err:
             # Roll back optimistic state since the command didn't take.
             self.__dict__.pop("_attr_is_on", None)
             self._optimistic_baseline = None
@@ -145,4 +163,6 @@ class SmartSlydrPetpassSwitch(CoordinatorEntity, SwitchEntity):
             raise HomeAssistantError(
                 f"SmartSlydr petpass command failed: {err}"
             ) from err
-        self.coordinator.trigger_fast_poll()
+        # Verification reads back off until the backend shows the new
+        # value; the override above drops as soon as it does.
+        self.coordinator.async_expect(self._device_id, "petpass", bool(value))
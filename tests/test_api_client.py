@@ -9,13 +9,31 @@ from __future__ import annotations
 import asyncio
 
 import pytest
-from aiohttp import ClientSession
-from aioresponses import aioresponses
+from aiohttp import ClientResponseError, ClientSession
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
 
 from custom_components.smartslydr.api_client import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    COMMAND_BATCH_WINDOW_S,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PRIORITY_STATUS,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY_S,
+    RETRY_BUDGET_MIN,
+    RETRY_MAX_DELAY_S,
+    TOKEN_EXPIRY_MARGIN,
+    TOKEN_REFRESH_AHEAD,
     SmartSlydrApiClient,
     SmartSlydrApiError,
     SmartSlydrAuthError,
+    SmartSlydrCircuitOpenError,
+    SmartSlydrRateLimitedError,
+    _TokenBucket,
     _redact,
     _raise_if_upstream_error,
 )
@@ -132,6 +150,29 @@ async def test_authenticate_missing_access_token_raises_api_error(
             await client.authenticate()
 
 
+@pytest.mark.asyncio
+async def test_token_state_round_trips_and_skips_auth(session: ClientSession) -> None:
+    """A restored token goes straight to /devices; new tokens reach the listener."""
+    saved: list[dict] = []
+    with aioresponses() as m:
+        m.post(
+            f"{BASE}/auth",
+            payload={"access_token": "abc", "refresh_token": "def"},
+        )
+        first = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        first.set_token_listener(saved.append)
+        await first.authenticate()
+    assert saved == [first.token_state()]
+
+    with aioresponses() as m:
+        # No /auth registered: any attempt would fail the request.
+        m.get(f"{BASE}/devices", payload={"room_lists": []})
+        second = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        assert second.restore_token(saved[0])
+        assert await second.get_devices() == []
+        assert not second.restore_token({"access_token": "x", "expires": "soon"})
+
+
 # ---------------------------------------------------------------------
 # get_devices
 # ---------------------------------------------------------------------
@@ -202,13 +243,15 @@ async def test_get_devices_lambda_error_payload_raises(
 async def test_get_devices_retries_5xx_then_succeeds(
     session: ClientSession, monkeypatch
 ) -> None:
-    # Replace asyncio.sleep with a no-op so retries don't actually wait. We
-    # can't `lambda: asyncio.sleep(0)` - that recurses through the patched
-    # name. Define an explicit async no-op instead.
+    # Replace the retry back-off with a no-op so retries don't actually
+    # wait. Only the client's own sleep is patched; the loop, aiohttp and
+    # aioresponses keep the real asyncio.sleep.
     async def _no_sleep(*_a, **_kw):
         return None
 
-    monkeypatch.setattr("asyncio.sleep", _no_sleep)
+    monkeypatch.setattr(
+        "custom_components.smartslydr.api_client._retry_sleep", _no_sleep
+    )
     with aioresponses() as m:
         m.post(f"{BASE}/auth", payload={"access_token": "tok"})
         m.get(f"{BASE}/devices", status=503)
@@ -225,13 +268,15 @@ async def test_get_devices_does_not_retry_4xx(
 ) -> None:
     import aiohttp
 
-    # Replace asyncio.sleep with a no-op so retries don't actually wait. We
-    # can't `lambda: asyncio.sleep(0)` - that recurses through the patched
-    # name. Define an explicit async no-op instead.
+    # Replace the retry back-off with a no-op so retries don't actually
+    # wait. Only the client's own sleep is patched; the loop, aiohttp and
+    # aioresponses keep the real asyncio.sleep.
     async def _no_sleep(*_a, **_kw):
         return None
 
-    monkeypatch.setattr("asyncio.sleep", _no_sleep)
+    monkeypatch.setattr(
+        "custom_components.smartslydr.api_client._retry_sleep", _no_sleep
+    )
     with aioresponses() as m:
         m.post(f"{BASE}/auth", payload={"access_token": "tok"})
         m.get(f"{BASE}/devices", status=404)
@@ -247,13 +292,15 @@ async def test_set_command_does_not_retry(
     """State-changing calls must not retry - could double-actuate the cover."""
     import aiohttp
 
-    # Replace asyncio.sleep with a no-op so retries don't actually wait. We
-    # can't `lambda: asyncio.sleep(0)` - that recurses through the patched
-    # name. Define an explicit async no-op instead.
+    # Replace the retry back-off with a no-op so retries don't actually
+    # wait. Only the client's own sleep is patched; the loop, aiohttp and
+    # aioresponses keep the real asyncio.sleep.
     async def _no_sleep(*_a, **_kw):
         return None
 
-    monkeypatch.setattr("asyncio.sleep", _no_sleep)
+    monkeypatch.setattr(
+        "custom_components.smartslydr.api_client._retry_sleep", _no_sleep
+    )
     with aioresponses() as m:
         m.post(f"{BASE}/auth", payload={"access_token": "tok"})
         m.post(f"{BASE}/operation", status=503)
@@ -285,3 +332,528 @@ async def test_concurrent_ensure_token_collapses_to_one_auth(
             for call in calls
         ]
         assert len(auth_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_renews_before_expiry(session: ClientSession) -> None:
+    """The server's expires_in drives an early /token renewal off the request path."""
+    with aioresponses() as m:
+        # Expires (after the safety margin) just past the refresh-ahead
+        # window, so the renewal is due almost immediately.
+        lifetime = (TOKEN_EXPIRY_MARGIN + TOKEN_REFRESH_AHEAD).total_seconds() + 0.05
+        m.post(
+            f"{BASE}/auth",
+            payload={"access_token": "a1", "refresh_token": "r1", "expires_in": lifetime},
+        )
+        m.post(f"{BASE}/token", payload={"access_token": "a2", "expires_in": 1800})
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.enable_background_refresh()
+        await client.authenticate()
+        assert client._access_token == "a1"
+
+        await asyncio.sleep(0.2)
+        assert client._access_token == "a2"
+        # Valid token: requests take the lock-free path.
+        assert client._token_valid()
+        client.shutdown()
+        assert client._refresh_handle is None
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_reauths_once_and_replays(session: ClientSession) -> None:
+    """Concurrent 401s on a revoked token share one /auth, then each replays once."""
+    with aioresponses() as m:
+        m.post(f"{BASE}/auth", payload={"access_token": "fresh"})
+
+        def _reject_revoked(payload):
+            def _callback(url, headers=None, **kwargs):
+                if headers["Authorization"] == "revoked":
+                    return CallbackResult(status=401, reason="Unauthorized", payload={})
+                return CallbackResult(payload=payload)
+
+            return _callback
+
+        m.get(
+            f"{BASE}/devices",
+            callback=_reject_revoked({"room_lists": []}),
+            repeat=True,
+        )
+        m.post(
+            f"{BASE}/operation",
+            callback=_reject_revoked({"response": ["ok"]}),
+            repeat=True,
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "revoked", "expires": "2999-01-01T00:00:00+00:00"})
+
+        rooms, result = await asyncio.gather(
+            client.get_devices(), client.set_command([{"device_id": "d1"}])
+        )
+        assert rooms == []
+        assert result == ["ok"]
+        auth_calls = [
+            call
+            for (method, url), calls in m.requests.items()
+            if method == "POST" and str(url).endswith("/auth")
+            for call in calls
+        ]
+        assert len(auth_calls) == 1
+        # Each request was sent once with the revoked token at most, and
+        # replayed at most once.
+        for key in (("GET", URL(f"{BASE}/devices")), ("POST", URL(f"{BASE}/operation"))):
+            assert len(m.requests[key]) <= 2
+
+
+@pytest.mark.asyncio
+async def test_second_401_is_not_replayed_again(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.post(f"{BASE}/auth", payload={"access_token": "fresh"})
+        m.post(f"{BASE}/operation", status=401, payload={}, repeat=True)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "revoked", "expires": "2999-01-01T00:00:00+00:00"})
+        with pytest.raises(SmartSlydrAuthError):
+            await client.set_command([{"device_id": "d1"}])
+        assert len(m.requests[("POST", URL(f"{BASE}/operation"))]) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_request(
+    session: ClientSession,
+) -> None:
+    with aioresponses() as m:
+        m.get(f"{BASE}/devices", payload={"room_lists": [{"room": "a"}]})
+        m.post(f"{BASE}/operation/get", payload={"response": ["a"]})
+        m.post(f"{BASE}/operation/get", payload={"response": ["b"]})
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        results = await asyncio.gather(
+            client.get_devices(),
+            client.get_devices(),
+            client.get_devices(),
+            client.get_status([{"device_id": "d1"}]),
+            client.get_status([{"device_id": "d1"}]),
+            client.get_status([{"device_id": "d2"}]),
+        )
+        assert results[:3] == [[{"room": "a"}]] * 3
+        # Same payload joins; a different one is its own request.
+        assert results[3] == results[4]
+        assert results[5] != results[3]
+        assert len(m.requests[("GET", URL(f"{BASE}/devices"))]) == 1
+        assert len(m.requests[("POST", URL(f"{BASE}/operation/get"))]) == 2
+        assert client.diagnostics()["reads"] == {"upstream": 3, "coalesced": 3}
+
+        # Nothing in flight any more: the next read goes upstream.
+        m.get(f"{BASE}/devices", payload={"room_lists": []})
+        assert await client.get_devices() == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_read(
+    session: ClientSession,
+) -> None:
+    release = asyncio.Event()
+
+    async def _slow(url, **kwargs):
+        await release.wait()
+        return CallbackResult(payload={"room_lists": []})
+
+    with aioresponses() as m:
+        m.get(f"{BASE}/devices", callback=_slow)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        first = asyncio.ensure_future(client.get_devices())
+        second = asyncio.ensure_future(client.get_devices())
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == []
+        assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_go_out_as_one_batch(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.post(
+            f"{BASE}/operation",
+            payload={
+                "response": [
+                    {"device_id": "d1", "status": "ok"},
+                    {"device_id": "d2", "status": "ok"},
+                ]
+            },
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        first, second = await asyncio.gather(
+            client.set_command([{"device_id": "d1", "commands": [{"key": "position", "value": 0}]}]),
+            client.set_command([{"device_id": "d2", "commands": [{"key": "position", "value": 0}]}]),
+        )
+        # Each caller sees only its own device's result.
+        assert first == [{"device_id": "d1", "status": "ok"}]
+        assert second == [{"device_id": "d2", "status": "ok"}]
+        calls = m.requests[("POST", URL(f"{BASE}/operation"))]
+        assert len(calls) == 1
+        sent = calls[0].kwargs["json"]["setcommands"]
+        assert [e["device_id"] for e in sent] == ["d1", "d2"]
+        assert client.diagnostics()["commands"] == {"calls": 2, "requests": 1}
+
+
+@pytest.mark.asyncio
+async def test_batched_command_failure_reaches_every_caller(
+    session: ClientSession,
+) -> None:
+    with aioresponses() as m:
+        m.post(
+            f"{BASE}/operation",
+            payload={"errorType": "TypeError", "errorMessage": "boom"},
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        results = await asyncio.gather(
+            client.set_command([{"device_id": "d1", "commands": []}]),
+            client.set_command([{"device_id": "d2", "commands": []}]),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, SmartSlydrApiError) for r in results)
+        assert len(m.requests[("POST", URL(f"{BASE}/operation"))]) == 1
+
+
+@pytest.mark.asyncio
+async def test_commands_for_same_device_are_not_merged(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.post(f"{BASE}/operation", payload={"response": []}, repeat=True)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        await asyncio.gather(
+            client.set_command([{"device_id": "d1", "commands": [{"key": "position", "value": 0}]}]),
+            client.set_command([{"device_id": "d1", "commands": [{"key": "position", "value": 101}]}]),
+        )
+        calls = m.requests[("POST", URL(f"{BASE}/operation"))]
+        # Two requests, in the order the commands were issued.
+        assert [
+            c.kwargs["json"]["setcommands"][0]["commands"][0]["value"] for c in calls
+        ] == [0, 101]
+
+
+@pytest.mark.asyncio
+async def test_later_batch_waits_for_a_slow_earlier_one(session: ClientSession) -> None:
+    release = asyncio.Event()
+    started: list[int] = []
+
+    async def _slow_first(url, **kwargs):
+        value = kwargs["json"]["setcommands"][0]["commands"][0]["value"]
+        started.append(value)
+        if len(started) == 1:
+            await release.wait()
+        return CallbackResult(payload={"response": []})
+
+    with aioresponses() as m:
+        m.post(f"{BASE}/operation", callback=_slow_first, repeat=True)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        first = asyncio.ensure_future(
+            client.set_command([{"device_id": "d1", "commands": [{"key": "position", "value": 0}]}])
+        )
+        # The first batch has left its window and is stuck in flight.
+        await asyncio.sleep(COMMAND_BATCH_WINDOW_S * 2)
+        assert started == [0]
+        second = asyncio.ensure_future(
+            client.set_command([{"device_id": "d1", "commands": [{"key": "position", "value": 101}]}])
+        )
+        await asyncio.sleep(COMMAND_BATCH_WINDOW_S * 2)
+        assert started == [0]
+
+        release.set()
+        await asyncio.gather(first, second)
+        # The later target goes out last, so it is what the door ends at.
+        assert started == [0, 101]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_beyond_burst(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.post(f"{BASE}/operation/get", payload={"response": []}, repeat=True)
+        client = SmartSlydrApiClient(
+            "u", "p", session, base_url=BASE, rate_limit=50.0, rate_burst=2
+        )
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(4):
+            await client.get_status([{"device_id": f"d{i}"}])
+        # Two from the burst, then one per 20ms.
+        assert loop.time() - started >= 0.035
+        stats = client.diagnostics()["rate_limit"]
+        assert stats["throttled"] == 2
+        assert stats["rate_limited"] == 0
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_bucket_for_retry_after_and_read_retries(
+    session: ClientSession,
+) -> None:
+    with aioresponses() as m:
+        m.get(
+            f"{BASE}/devices",
+            status=429,
+            reason="Too Many Requests",
+            headers={"Retry-After": "0.05"},
+            payload={},
+        )
+        m.get(f"{BASE}/devices", payload={"room_lists": []})
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await client.get_devices() == []
+        assert loop.time() - started >= 0.05
+        assert client.diagnostics()["rate_limit"]["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_429_with_long_retry_after_fails_fast(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.get(
+            f"{BASE}/devices",
+            status=429,
+            reason="Too Many Requests",
+            headers={"Retry-After": "120"},
+            payload={},
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        with pytest.raises(ClientResponseError) as err:
+            await client.get_devices()
+        assert err.value.status == 429
+        assert client.diagnostics()["rate_limit"]["paused_for"] > 100
+
+
+@pytest.mark.asyncio
+async def test_long_pause_fails_commands_and_reads_fast(session: ClientSession) -> None:
+    with aioresponses() as m:
+        m.get(
+            f"{BASE}/devices",
+            status=429,
+            reason="Too Many Requests",
+            headers={"Retry-After": "3600"},
+            payload={},
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+        with pytest.raises(ClientResponseError):
+            await client.get_devices()
+
+        # Neither waits out the hour; nothing is sent.
+        with pytest.raises(SmartSlydrRateLimitedError):
+            await asyncio.wait_for(
+                client.set_command([{"device_id": "d1", "commands": []}]), 1
+            )
+        with pytest.raises(SmartSlydrRateLimitedError):
+            await asyncio.wait_for(client.get_status([]), 1)
+        assert ("POST", URL(f"{BASE}/operation")) not in m.requests
+        # Refused locally, so no verdict on the backend's health.
+        assert client.circuit_state == CIRCUIT_CLOSED
+        assert client.diagnostics()["circuit"]["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_long_pause_releases_requests_already_waiting() -> None:
+    bucket = _TokenBucket(rate=0.01, burst=1)
+    await bucket.acquire(PRIORITY_COMMAND)
+    waiting = asyncio.ensure_future(bucket.acquire(PRIORITY_COMMAND))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    bucket.pause(3600)
+    with pytest.raises(SmartSlydrRateLimitedError):
+        await asyncio.wait_for(waiting, 1)
+
+
+@pytest.mark.asyncio
+async def test_bucket_serves_commands_before_reads_before_polls() -> None:
+    bucket = _TokenBucket(rate=50.0, burst=1)
+    await bucket.acquire(PRIORITY_STATUS)  # drain the burst
+    order: list[str] = []
+
+    async def _take(name: str, priority: int) -> None:
+        await bucket.acquire(priority)
+        order.append(name)
+
+    # Queued in the worst order: poll first, command last.
+    tasks = [
+        asyncio.ensure_future(_take("poll", PRIORITY_POLL)),
+        asyncio.ensure_future(_take("status", PRIORITY_STATUS)),
+        asyncio.ensure_future(_take("command", PRIORITY_COMMAND)),
+    ]
+    await asyncio.sleep(0)
+    assert bucket.pending(PRIORITY_COMMAND)
+    await asyncio.gather(*tasks)
+    assert order == ["command", "status", "poll"]
+    assert not bucket.pending(PRIORITY_POLL)
+
+
+@pytest.mark.asyncio
+async def test_polls_leave_a_token_for_commands() -> None:
+    bucket = _TokenBucket(rate=0.01, burst=2)
+    await bucket.acquire(PRIORITY_POLL)
+    # One token left: a poll waits for it, a command takes it at once.
+    poll = asyncio.ensure_future(bucket.acquire(PRIORITY_POLL))
+    await asyncio.sleep(0)
+    assert not poll.done()
+    await asyncio.wait_for(bucket.acquire(PRIORITY_COMMAND), 0.1)
+    poll.cancel()
+
+
+@pytest.fixture
+def fast_sleep(monkeypatch):
+    """Make retry back-off sleeps instant while still yielding to the loop."""
+
+    async def _fast_sleep(*_a, **_kw):
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(
+        "custom_components.smartslydr.api_client._retry_sleep", _fast_sleep
+    )
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_probes_once(
+    session: ClientSession, fast_sleep
+) -> None:
+    release = asyncio.Event()
+
+    async def _probe(url, **kwargs):
+        await release.wait()
+        return CallbackResult(payload={"response": ["ok"]})
+
+    with aioresponses() as m:
+        m.post(
+            f"{BASE}/operation/get",
+            status=503,
+            reason="Service Unavailable",
+            payload={},
+            repeat=True,
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE, rate_limit=100)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+
+        # Fail calls (with whatever retries the budget allows) until
+        # the circuit opens.
+        for i in range(CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises((ClientResponseError, SmartSlydrCircuitOpenError)):
+                await client.get_status([{"device_id": f"d{i}"}])
+            if client.circuit_state == CIRCUIT_OPEN:
+                break
+        assert client.circuit_state == CIRCUIT_OPEN
+        sent = len(m.requests[("POST", URL(f"{BASE}/operation/get"))])
+        assert sent == CIRCUIT_FAILURE_THRESHOLD
+
+        # Open: no request goes out.
+        with pytest.raises(SmartSlydrCircuitOpenError):
+            await client.get_status([{"device_id": "d9"}])
+        assert len(m.requests[("POST", URL(f"{BASE}/operation/get"))]) == sent
+
+        # Cooldown over: one probe goes out, everyone else still fails fast.
+        client._breaker.open_for = 0
+        m.clear()
+        m.post(f"{BASE}/operation/get", callback=_probe)
+        probe = asyncio.ensure_future(client.get_status([{"device_id": "d1"}]))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert client.circuit_state == CIRCUIT_HALF_OPEN
+        with pytest.raises(SmartSlydrCircuitOpenError):
+            await client.set_command([{"device_id": "d2", "commands": []}])
+        release.set()
+        assert await probe == ["ok"]
+        assert client.circuit_state == CIRCUIT_CLOSED
+        assert client.diagnostics()["circuit"]["opened"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_probe_skips_the_open_cooldown(
+    session: ClientSession, fast_sleep
+) -> None:
+    with aioresponses() as m:
+        m.get(f"{BASE}/devices", exception=asyncio.TimeoutError(), repeat=True)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE, rate_limit=100)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises((asyncio.TimeoutError, SmartSlydrCircuitOpenError)):
+                await client.get_devices()
+        assert client.circuit_state == CIRCUIT_OPEN
+
+        m.clear()
+        m.get(f"{BASE}/devices", payload={"room_lists": []})
+        client.request_probe()
+        assert await client.get_devices() == []
+        assert client.circuit_state == CIRCUIT_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries_and_records_per_label(
+    session: ClientSession, fast_sleep
+) -> None:
+    with aioresponses() as m:
+        m.post(
+            f"{BASE}/operation/get",
+            status=502,
+            reason="Bad Gateway",
+            payload={},
+            repeat=True,
+        )
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE, rate_limit=100)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+        client._breaker.threshold = 100
+
+        for i in range(3):
+            with pytest.raises(ClientResponseError):
+                await client.get_status([{"device_id": f"d{i}"}])
+
+        # The budget's floor covers the first call's retries and one of
+        # the second's; after that calls fail on their first attempt.
+        stats = client.diagnostics()["retries"]["GET_STATUS"]
+        assert stats["calls"] == 3
+        assert stats["retries"] == RETRY_BUDGET_MIN
+        assert stats["denied"] == 2
+        assert len(m.requests[("POST", URL(f"{BASE}/operation/get"))]) == (
+            3 + RETRY_BUDGET_MIN
+        )
+        assert "GET_DEVICES" not in client.diagnostics()["retries"]
+
+
+@pytest.mark.asyncio
+async def test_retry_delays_are_jittered_within_bounds(
+    session: ClientSession, monkeypatch
+) -> None:
+    delays: list[float] = []
+
+    async def _record(delay, *_a, **_kw):
+        delays.append(delay)
+
+    monkeypatch.setattr(
+        "custom_components.smartslydr.api_client._retry_sleep", _record
+    )
+    with aioresponses() as m:
+        m.get(f"{BASE}/devices", status=503, reason="Unavailable", payload={}, repeat=True)
+        client = SmartSlydrApiClient("u", "p", session, base_url=BASE, rate_limit=100)
+        client.restore_token({"access_token": "t", "expires": "2999-01-01T00:00:00+00:00"})
+        client._breaker.threshold = 100
+        client._retry_budget.minimum = 100
+
+        for _ in range(10):
+            with pytest.raises(ClientResponseError):
+                await client.get_devices()
+
+    assert len(delays) == 10 * RETRY_ATTEMPTS
+    assert all(RETRY_BASE_DELAY_S <= d <= RETRY_MAX_DELAY_S for d in delays)
+    # Not a fixed schedule: callers that failed together spread out.
+    assert len(set(delays)) > RETRY_ATTEMPTS
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -121,3 +122,36 @@ async def test_reauth_confirm_updates_password(hass: HomeAssistant) -> None:
     assert result2["type"] == FlowResultType.ABORT
     assert result2["reason"] == "reauth_successful"
     assert hass.config_entries.async_get_entry(entry.entry_id).data[CONF_PASSWORD] == "new"
+
+
+@pytest.mark.asyncio
+async def test_user_step_hands_token_to_setup(hass: HomeAssistant) -> None:
+    """The token the flow validated with is reused by setup, not re-fetched."""
+
+    async def _authenticate(client) -> None:
+        client._access_token = "from-flow"
+        client._token_expires = datetime.now(timezone.utc) + timedelta(minutes=20)
+
+    with patch(
+        "custom_components.smartslydr.api_client.SmartSlydrApiClient.authenticate",
+        new=_authenticate,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_USERNAME: "user@example.com", CONF_PASSWORD: "pw"},
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entry = result["result"]
+    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    assert client._access_token == "from-flow"
@@ -5,10 +5,20 @@ These touch only the helpers module (no HA fixtures required).
 
 from __future__ import annotations
 
+import json
+
 from custom_components.smartslydr.helpers import (
+    DEVICE_FIELDS,
     SmartSlydrCoordinatorData,
+    diff_snapshots,
+    get_device,
     iter_devices,
     iter_devices_in_rooms,
+    merge_statuses,
+    parse_device,
+    parse_devices,
+    snapshot_from_dict,
+    snapshot_to_dict,
 )
 
 
@@ -53,24 +63,192 @@ def test_iter_devices_in_rooms_handles_non_list_input() -> None:
 
 
 def test_iter_devices_accepts_coordinator_data_instance() -> None:
-    data = SmartSlydrCoordinatorData(
-        rooms=[{"device_list": [{"device_id": "x"}]}],
-        petpass_states={},
-    )
-    assert [d["device_id"] for d in iter_devices(data)] == ["x"]
+    _, devices = parse_devices([{"device_list": [{"device_id": "x"}]}])
+    data = SmartSlydrCoordinatorData(devices=devices, petpass_states={})
+    assert [d.device_id for d in iter_devices(data)] == ["x"]
 
 
 def test_iter_devices_handles_none() -> None:
     assert list(iter_devices(None)) == []
 
 
+def test_parse_devices_indexes_by_device_id() -> None:
+    rooms = [
+        {"room_name": "Den", "device_list": [{"device_id": "d1"}, {"devicename": "no id"}]},
+        None,
+        {"device_list": [{"device_id": "d2"}, {"device_id": "d1", "devicename": "dup"}]},
+    ]
+    parsed_rooms, devices = parse_devices(rooms)
+    assert list(devices) == ["d1", "d2"]
+    # First occurrence wins, same as the old linear scan.
+    assert devices["d1"].name == "d1"
+    assert devices["d1"].room == "Den"
+    assert [r.device_ids for r in parsed_rooms] == [("d1",), ("d2",)]
+
+
+def test_parse_device_coerces_fields_once() -> None:
+    dev = parse_device(
+        {
+            "device_id": "d1",
+            "devicename": "Patio",
+            "position": "40",
+            "status": "device is online",
+            "temperature": 21.5,
+            "wlanmac": None,
+            "petpass": [{"name": "Rex", "tag": "ignored"}, "junk", {"name": "Tom"}],
+            "firmware": "dropped",
+        }
+    )
+    assert dev is not None
+    assert dev.position == 40
+    assert dev.allowed_pets == ("Rex", "Tom")
+    assert dev.telemetry.temperature == 21.5
+    assert dev.telemetry.humidity is None
+    # A field reported as null still counts as reported.
+    assert dev.reported == frozenset({"temperature", "wlanmac", "status"})
+    assert not hasattr(dev, "__dict__")
+
+
+def test_parse_device_position_absent_or_junk() -> None:
+    assert parse_device({"device_id": "d1"}).position is None
+    assert parse_device({"device_id": "d1", "position": None}).position == 0
+    assert parse_device({"device_id": "d1", "position": "abc"}).position == 0
+    assert parse_device({"devicename": "no id"}) is None
+
+
+def test_get_device_handles_missing_data_and_ids() -> None:
+    _, devices = parse_devices([{"device_list": [{"device_id": "d1"}]}])
+    data = SmartSlydrCoordinatorData(devices=devices)
+    assert get_device(data, "d1").device_id == "d1"
+    assert get_device(data, "gone") is None
+    assert get_device(None, "d1") is None
+
+
+def test_get_device_does_not_scan_rooms() -> None:
+    """Entity lookups must go through the index, never the room list.
+
+    A full poll fan-out (every entity reading its device) used to cost
+    entities x devices; with the index it's one dict hit per entity.
+    """
+
+    class _Unscannable(tuple):
+        def __iter__(self):
+            raise AssertionError("rooms scanned during lookup")
+
+    n = 500
+    parsed_rooms, devices = parse_devices(
+        [{"device_list": [{"device_id": f"d{i}"} for i in range(n)]}]
+    )
+    data = SmartSlydrCoordinatorData(
+        rooms=_Unscannable(parsed_rooms), devices=devices
+    )
+    for i in range(n):
+        assert get_device(data, f"d{i}").device_id == f"d{i}"
+
+
 def test_coordinator_data_is_frozen() -> None:
-    data = SmartSlydrCoordinatorData(rooms=[], petpass_states={})
+    data = SmartSlydrCoordinatorData(rooms=(), petpass_states={})
     import dataclasses
 
     try:
-        data.rooms = [{"device_id": "x"}]  # type: ignore[misc]
+        data.rooms = ()  # type: ignore[misc]
     except dataclasses.FrozenInstanceError:
         pass
     else:
         raise AssertionError("Expected FrozenInstanceError")
+
+
+def _snapshot(devices: list[dict], petpass: dict | None = None):
+    parsed_rooms, parsed = parse_devices([{"device_list": devices}])
+    return SmartSlydrCoordinatorData(
+        rooms=parsed_rooms, devices=parsed, petpass_states=petpass or {}
+    )
+
+
+def test_diff_snapshots_without_previous_is_everything() -> None:
+    assert diff_snapshots(None, _snapshot([{"device_id": "d1"}])) is None
+
+
+def test_diff_snapshots_quiet_poll_is_empty() -> None:
+    devices = [{"device_id": "d1", "position": 50, "temperature": 20}]
+    old = _snapshot(devices, {"d1": True})
+    new = _snapshot([dict(d) for d in devices], {"d1": True})
+    assert diff_snapshots(old, new) == {}
+
+
+def test_diff_snapshots_reports_changed_fields_per_device() -> None:
+    old = _snapshot(
+        [
+            {"device_id": "d1", "position": 50, "temperature": 20},
+            {"device_id": "d2", "position": 0},
+        ],
+        {"d1": False, "d2": False},
+    )
+    new = _snapshot(
+        [
+            {"device_id": "d1", "position": 50, "temperature": 21},
+            {"device_id": "d2", "position": 0},
+            {"device_id": "d3"},
+        ],
+        {"d1": True, "d2": False},
+    )
+    changes = diff_snapshots(old, new)
+    assert changes["d1"] == frozenset({"temperature", "petpass"})
+    assert "d2" not in changes
+    assert changes["d3"] == DEVICE_FIELDS
+
+
+def test_merge_statuses_updates_position_and_petpass() -> None:
+    old = _snapshot(
+        [{"device_id": "d1", "position": 0}, {"device_id": "d2"}],
+        {"d1": False},
+    )
+    new = merge_statuses(
+        old,
+        [
+            {"device_id": "d1", "position": "60"},
+            {"device_id": "d1", "petpass": "on"},
+            # No position entity for d2 - ignored.
+            {"device_id": "d2", "position": 10},
+            # Unknown device - left for the next full poll.
+            {"device_id": "d9", "petpass": "on"},
+            "junk",
+        ],
+    )
+    assert new.devices["d1"].position == 60
+    assert new.devices["d2"].position is None
+    assert new.petpass_states == {"d1": True}
+    # The input snapshot is untouched.
+    assert old.devices["d1"].position == 0
+
+
+def test_snapshot_round_trips_through_json() -> None:
+    rooms = [
+        {
+            "room_name": "Den",
+            "device_list": [
+                {
+                    "device_id": "d1",
+                    "devicename": "Patio",
+                    "position": "40",
+                    "temperature": 21.5,
+                    "status": None,
+                    "petpass": [{"name": "Rex"}],
+                },
+                {"device_id": "d2"},
+            ],
+        }
+    ]
+    parsed_rooms, devices = parse_devices(rooms)
+    data = SmartSlydrCoordinatorData(
+        rooms=parsed_rooms, petpass_states={"d1": True}, devices=devices
+    )
+    raw = json.loads(json.dumps(snapshot_to_dict(data)))
+    assert snapshot_from_dict(raw) == data
+    assert snapshot_from_dict(raw).devices["d2"].position is None
+
+
+def test_snapshot_from_dict_rejects_malformed() -> None:
+    assert snapshot_from_dict(None) is None
+    assert snapshot_from_dict({"rooms": []}) is None
+    assert snapshot_from_dict({"rooms": [], "devices": [{}], "petpass_states": {}}) is None
@@ -2,16 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 import aiohttp
 import pytest
+from aioresponses import aioresponses
+from homeassistant.config_entries import SOURCE_REAUTH
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import issue_registry as ir
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity_registry as er,
+    issue_registry as ir,
+)
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+from yarl import URL
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.smartslydr.api_client import SmartSlydrApiError
-from custom_components.smartslydr.const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from custom_components.smartslydr.api_client import SmartSlydrApiError, SmartSlydrAuthError
+from custom_components.smartslydr.const import (
+    CONF_MOTION_MODE,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DEFAULT_BASE_URL,
+    DEFAULT_MOVE_DURATION,
+    DOMAIN,
+    MOTION_MODE_ATTRIBUTES,
+)
+from custom_components.smartslydr.coordinator import (
+    _POLL_DEFER_S,
+    MAX_POLL_INTERVAL,
+    RECOVERY_STEP,
+)
+from custom_components.smartslydr.cover import SmartSlydrCover
+from custom_components.smartslydr.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.smartslydr.helpers import (
+    SmartSlydrCoordinatorData,
+    SmartSlydrDevice,
+    parse_devices,
+    snapshot_to_dict,
+)
+from custom_components.smartslydr.motion import async_get_motion_scheduler
 
 ISSUE_UPSTREAM_UNEXPECTED = "upstream_unexpected_response"
 ISSUE_UPSTREAM_UNAVAILABLE = "upstream_unavailable"
@@ -54,6 +94,120 @@ async def test_unexpected_response_creates_repair_issue(
     assert issue.severity == ir.IssueSeverity.WARNING
 
 
+@pytest.mark.asyncio
+async def test_diagnostics_are_json_serializable(hass: HomeAssistant) -> None:
+    entry = _entry(hass)
+    rooms = [
+        {
+            "room_name": "Den",
+            "device_list": [
+                {"device_id": "d1", "position": 0, "temperature": 21, "wlanmac": "aa"}
+            ],
+        }
+    ]
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        diag = await async_get_config_entry_diagnostics(hass, entry)
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+    # What the diagnostics download actually does with the dict.
+    decoded = json.loads(json_bytes(diag))
+    (device,) = decoded["coordinator_data"]["devices"]
+    assert device["device_id"] == "d1"
+    assert "temperature" in device["reported"]
+    assert decoded["entry"]["data"][CONF_PASSWORD] == "**REDACTED**"
+
+
+@pytest.mark.asyncio
+async def test_poll_fan_out_device_lookups_scale_linearly(hass: HomeAssistant) -> None:
+    """Entity updates after a poll cost a fixed number of lookups per device.
+
+    Counts every lookup into the snapshot's device index while a poll
+    that changes every device fans out to the real cover, switch and
+    sensor entities. Scanning rooms per lookup grew with devices^2.
+    """
+
+    class _CountingDevices(dict):
+        lookups = 0
+
+        def get(self, key, default=None):
+            self.lookups += 1
+            return super().get(key, default)
+
+        def __getitem__(self, key):
+            self.lookups += 1
+            return super().__getitem__(key)
+
+    published: list[_CountingDevices] = []
+
+    def _parse_devices(rooms):
+        parsed_rooms, devices = parse_devices(rooms)
+        published.append(_CountingDevices(devices))
+        return parsed_rooms, published[-1]
+
+    def _rooms(n: int, position: int, temperature: int) -> list[dict]:
+        return [
+            {
+                "room_name": "Den",
+                "device_list": [
+                    {
+                        "device_id": f"n{n}d{i}",
+                        "position": position,
+                        "temperature": temperature,
+                    }
+                    for i in range(n)
+                ],
+            }
+        ]
+
+    lookups: dict[int, int] = {}
+    for n in (10, 100, 1000):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"user{n}@example.com",
+            data={CONF_USERNAME: f"user{n}@example.com", CONF_PASSWORD: "pw"},
+            version=2,
+        )
+        entry.add_to_hass(hass)
+        get_devices = AsyncMock(return_value=_rooms(n, 0, 20))
+        with patch(
+            "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+            new=get_devices,
+        ), patch(
+            "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+            new=AsyncMock(return_value=[]),
+        ), patch(
+            "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+            new=AsyncMock(return_value=None),
+        ), patch(
+            "custom_components.smartslydr.coordinator.parse_devices",
+            side_effect=_parse_devices,
+        ):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+            get_devices.return_value = _rooms(n, 50, 21)
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            lookups[n] = published[-1].lookups
+            assert await hass.config_entries.async_unload(entry.entry_id)
+
+    assert lookups[10] > 0
+    assert lookups[100] == 10 * lookups[10]
+    assert lookups[1000] == 10 * lookups[100]
+
+
 @pytest.mark.asyncio
 async def test_successful_poll_clears_repair_issue(hass: HomeAssistant) -> None:
     entry = _entry(hass)
@@ -139,3 +293,787 @@ async def test_oserror_creates_unavailable_issue(hass: HomeAssistant) -> None:
     issue_reg = ir.async_get(hass)
     issue = issue_reg.async_get_issue(DOMAIN, ISSUE_UPSTREAM_UNAVAILABLE)
     assert issue is not None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_poll_skips_entity_state_writes(hass: HomeAssistant) -> None:
+    """A poll that changes nothing must not rewrite every entity's state."""
+    entry = _entry(hass)
+    rooms = [
+        {
+            "room_name": "Den",
+            "device_list": [
+                {
+                    "device_id": "d1",
+                    "devicename": "Patio",
+                    "position": 0,
+                    "temperature": 20,
+                    "status": "device is online",
+                }
+            ],
+        }
+    ]
+    get_devices = AsyncMock(return_value=rooms)
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[{"device_id": "d1", "petpass": "ff"}]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+        with patch(
+            "homeassistant.helpers.entity.Entity.async_write_ha_state"
+        ) as write:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        assert write.call_count == 0
+
+        device = {**rooms[0]["device_list"][0], "temperature": 21}
+        changed = [{"room_name": "Den", "device_list": [device]}]
+        get_devices.return_value = changed
+        with patch(
+            "homeassistant.helpers.entity.Entity.async_write_ha_state"
+        ) as write:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        # Only the temperature sensor moved.
+        assert write.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_pipelines_petpass_query_and_follows_up_new_devices(
+    hass: HomeAssistant,
+) -> None:
+    """/operation/get for known devices runs alongside /devices.
+
+    Only devices that weren't in the previous snapshot get a follow-up
+    query after /devices returns.
+    """
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1"}]}]
+    events: list[str] = []
+
+    async def _get_devices(self):
+        events.append("devices:start")
+        await asyncio.sleep(0)
+        events.append("devices:end")
+        return rooms
+
+    async def _get_status(self, commands, **kwargs):
+        events.append("status:" + ",".join(c["device_id"] for c in commands))
+        return [{"device_id": c["device_id"], "petpass": "on"} for c in commands]
+
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=_get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=_get_status,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        # First poll has no previous snapshot, so it's sequential.
+        assert events == ["devices:start", "devices:end", "status:d1"]
+
+        events.clear()
+        rooms.append({"device_list": [{"device_id": "d2"}]})
+        await coordinator.async_refresh()
+
+    assert events == ["devices:start", "status:d1", "devices:end", "status:d2"]
+    assert coordinator.data.petpass_states == {"d1": True, "d2": True}
+
+
+@pytest.mark.asyncio
+async def test_expectation_verifies_only_target_until_settled(
+    hass: HomeAssistant,
+) -> None:
+    """A command's verification reads touch just that device and field.
+
+    Reads back off while the door hasn't arrived and stop once it has.
+    """
+    entry = _entry(hass)
+    devices = [
+        {"device_id": "d1", "position": 0},
+        {"device_id": "d2", "position": 0},
+    ]
+    rooms = [{"device_list": devices}]
+    get_devices = AsyncMock(return_value=rooms)
+    get_status = AsyncMock(return_value=[])
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=get_status,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        get_devices.reset_mock()
+        get_status.reset_mock()
+
+        coordinator.async_expect("d1", "position", 40, eta=5)
+
+        # Still moving at the first check.
+        get_status.return_value = [{"device_id": "d1", "position": 20}]
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=7))
+        await hass.async_block_till_done()
+        assert get_status.await_count == 1
+
+        # Arrived at the backed-off retry; nothing further is scheduled.
+        get_status.return_value = [{"device_id": "d1", "position": 40}]
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+        await hass.async_block_till_done()
+        assert get_status.await_count == 2
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=120))
+        await hass.async_block_till_done()
+
+    assert get_status.await_count == 2
+    get_devices.assert_not_called()
+    get_status.assert_awaited_with([{"device_id": "d1", "command": "position"}])
+    assert coordinator.data.devices["d1"].position == 40
+    assert coordinator.data.devices["d2"].position == 0
+
+
+@pytest.mark.asyncio
+async def test_cover_move_feeds_motion_model(hass: HomeAssistant) -> None:
+    """Fresh reads during a confirmed move become motion-model samples."""
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_status = AsyncMock(return_value=[])
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=get_status,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "cover", DOMAIN, "d1_cover"
+        )
+
+        loop_time = [hass.loop.time()]
+        with patch.object(hass.loop, "time", side_effect=lambda: loop_time[0]):
+            await hass.services.async_call(
+                "cover",
+                "set_cover_position",
+                {"entity_id": entity_id, "position": 60},
+                blocking=True,
+            )
+            # Halfway-ish read 4s in: an exact sample.
+            loop_time[0] += 4.0
+            get_status.return_value = [{"device_id": "d1", "position": 30}]
+            assert await coordinator.async_refresh_devices([("d1", "position")])
+            # Arrival 2s later: bracketed, sampled at the midpoint.
+            loop_time[0] += 2.0
+            get_status.return_value = [{"device_id": "d1", "position": 60}]
+            assert await coordinator.async_refresh_devices([("d1", "position")])
+
+        model = async_get_motion_scheduler(hass).model("d1")
+        assert [(s.distance, s.elapsed, s.opening) for s in model.samples] == [
+            (30, 4.0, True),
+            (60, 5.0, True),
+        ]
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_cover_learns_from_a_door_faster_than_predicted(
+    hass: HomeAssistant,
+) -> None:
+    """A door that beats the prediction is caught by the mid-move read."""
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_status = AsyncMock(return_value=[])
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=get_status,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        calibration = hass.data[DOMAIN][entry.entry_id]["calibration"]
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "cover", DOMAIN, "d1_cover"
+        )
+
+        loop_time = [hass.loop.time()]
+        with patch.object(hass.loop, "time", side_effect=lambda: loop_time[0]):
+            started = loop_time[0]
+            await hass.services.async_call(
+                "cover",
+                "set_cover_position",
+                {"entity_id": entity_id, "position": 100},
+                blocking=True,
+            )
+            # Predicted 10s (the default); the first read is half way.
+            exp = coordinator._expectations[("d1", "position")]
+            assert exp.due == started + DEFAULT_MOVE_DURATION / 2
+            # The door is already there: no read ever saw it in motion.
+            loop_time[0] += DEFAULT_MOVE_DURATION / 2
+            get_status.return_value = [{"device_id": "d1", "position": 100}]
+            assert await coordinator.async_refresh_devices([("d1", "position")])
+
+        model = async_get_motion_scheduler(hass).model("d1")
+        assert [(s.distance, s.elapsed) for s in model.samples] == [(100, 5.0)]
+        assert calibration.duration("d1") == 5.0
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_motion_attributes_publish_once_the_command_is_accepted(
+    hass: HomeAssistant,
+) -> None:
+    entry = _entry(hass)
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_MOTION_MODE: MOTION_MODE_ATTRIBUTES}
+    )
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    seen_during_send = []
+    clock = [1000.0]
+
+    async def _set_command(self, setcommands):
+        seen_during_send.append(dict(hass.states.get(entity_id).attributes))
+        return []
+
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=_set_command,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "custom_components.smartslydr.cover.time.monotonic",
+        side_effect=lambda: clock[0],
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entity_id = er.async_get(hass).async_get_entity_id("cover", DOMAIN, "d1_cover")
+
+        await hass.services.async_call(
+            "cover",
+            "set_cover_position",
+            {"entity_id": entity_id, "position": 60},
+            blocking=True,
+        )
+        # Nothing about the move is out while the command is in flight.
+        assert "motion_started_at" not in seen_during_send[0]
+        attrs = hass.states.get(entity_id).attributes
+        assert attrs["motion_target_position"] == 60
+        assert "motion_started_at" in attrs
+
+        # A rejected command leaves no move published.
+        await hass.services.async_call(
+            "cover", "stop_cover", {"entity_id": entity_id}, blocking=True
+        )
+        clock[0] += 10.0
+        with patch(
+            "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+            new=AsyncMock(side_effect=SmartSlydrAuthError("rejected")),
+        ), pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                "cover",
+                "set_cover_position",
+                {"entity_id": entity_id, "position": 20},
+                blocking=True,
+            )
+        state = hass.states.get(entity_id)
+        assert "motion_started_at" not in state.attributes
+        assert state.state not in ("opening", "closing")
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_option_changes_apply_live_without_reload(hass: HomeAssistant) -> None:
+    """Interval, URL and move-duration edits reach the running objects in place.
+
+    Entry data (credentials) still reloads.
+    """
+    entry = _entry(hass)
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        bucket = hass.data[DOMAIN][entry.entry_id]
+        client = bucket["client"]
+        client._access_token = "token"
+
+        with patch.object(hass.config_entries, "async_reload") as reload:
+            hass.config_entries.async_update_entry(
+                entry,
+                options={
+                    "scan_interval": 60,
+                    "base_url": "https://proxy.example/",
+                    "move_duration_d1": 12,
+                },
+            )
+            await hass.async_block_till_done()
+            reload.assert_not_called()
+
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_PASSWORD: "new"}
+            )
+            await hass.async_block_till_done()
+            reload.assert_called_once_with(entry.entry_id)
+
+    assert hass.data[DOMAIN][entry.entry_id] is bucket
+    assert bucket["coordinator"].update_interval == timedelta(seconds=60)
+    assert client.base_url == "https://proxy.example"
+    # A token from the old endpoint isn't reused against the new one.
+    assert client._access_token is None
+
+
+@pytest.mark.asyncio
+async def test_devices_added_and_removed_without_reload(hass: HomeAssistant) -> None:
+    """New devices get entities on the next poll; missing ones age out."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="user@example.com",
+        data={CONF_USERNAME: "user@example.com", CONF_PASSWORD: "pw"},
+        options={"stale_device_polls": 2},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    d1 = {"device_id": "d1", "position": 0, "temperature": 20}
+    d2 = {"device_id": "d2", "position": 50}
+    get_devices = AsyncMock(return_value=[{"device_list": [d1]}])
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        ent_reg = er.async_get(hass)
+        dev_reg = dr.async_get(hass)
+
+        with patch.object(hass.config_entries, "async_reload") as reload:
+            get_devices.return_value = [{"device_list": [d1, d2]}]
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            d2_cover = ent_reg.async_get_entity_id("cover", DOMAIN, "d2_cover")
+            assert d2_cover is not None
+            assert hass.states.get(d2_cover).attributes["current_position"] == 50
+
+            # d1 disappears: kept for one poll, removed on the second.
+            get_devices.return_value = [{"device_list": [d2]}]
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert dev_reg.async_get_device(identifiers={(DOMAIN, "d1")}) is not None
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        reload.assert_not_called()
+        assert dev_reg.async_get_device(identifiers={(DOMAIN, "d1")}) is None
+        assert ent_reg.async_get_entity_id("cover", DOMAIN, "d1_cover") is None
+        assert ent_reg.async_get_entity_id("sensor", DOMAIN, "d1_temperature") is None
+        assert ent_reg.async_get_entity_id("cover", DOMAIN, "d2_cover") == d2_cover
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_setup_restores_snapshot_and_refreshes_in_background(
+    hass: HomeAssistant, hass_storage
+) -> None:
+    """Setup publishes the persisted snapshot without waiting on the backend."""
+    entry = _entry(hass)
+    hass_storage[f"{DOMAIN}.snapshot.{entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.snapshot.{entry.entry_id}",
+        "data": snapshot_to_dict(
+            SmartSlydrCoordinatorData(
+                devices={"d1": SmartSlydrDevice(device_id="d1", name="Patio", position=30)}
+            )
+        ),
+    }
+    release = asyncio.Event()
+
+    async def _slow_devices(_client):
+        await release.wait()
+        return [{"device_list": [{"device_id": "d1", "position": 30}]}]
+
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=_slow_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        entity_id = er.async_get(hass).async_get_entity_id("cover", DOMAIN, "d1_cover")
+        state = hass.states.get(entity_id)
+        assert state.attributes["current_position"] == 30
+        assert state.attributes["assumed_state"] is True
+
+        release.set()
+        # The refresh is a background task, which block_till_done
+        # doesn't wait for.
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await hass.async_block_till_done()
+        # Same position, but the live poll still re-publishes to drop the flag.
+        assert "assumed_state" not in hass.states.get(entity_id).attributes
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_set_position_burst_sends_first_and_latest(hass: HomeAssistant) -> None:
+    """A slider drag sends its first value at once and its last when the window closes."""
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    set_command = AsyncMock(return_value=[])
+    clock = [1000.0]
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=set_command,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "custom_components.smartslydr.cover.time.monotonic",
+        side_effect=lambda: clock[0],
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entity_id = er.async_get(hass).async_get_entity_id("cover", DOMAIN, "d1_cover")
+
+        def _sent():
+            return [c.args[0][0]["commands"][0]["value"] for c in set_command.await_args_list]
+
+        for position in (20, 40, 70):
+            await hass.services.async_call(
+                "cover",
+                "set_cover_position",
+                {"entity_id": entity_id, "position": position},
+                blocking=True,
+            )
+        assert _sent() == [20]
+
+        clock[0] += 2.0
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+        assert _sent() == [20, 70]
+
+        # Stop preempts a queued target.
+        await hass.services.async_call(
+            "cover",
+            "set_cover_position",
+            {"entity_id": entity_id, "position": 10},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            "cover", "stop_cover", {"entity_id": entity_id}, blocking=True
+        )
+        clock[0] += 2.0
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+        await hass.async_block_till_done()
+        assert _sent() == [20, 70, 200]
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_drift_snap_writes_cover_state_once(hass: HomeAssistant) -> None:
+    """A poll that snaps a drifting animation publishes one state, not two."""
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_devices = AsyncMock(return_value=rooms)
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        entity_id = er.async_get(hass).async_get_entity_id("cover", DOMAIN, "d1_cover")
+
+        await hass.services.async_call(
+            "cover",
+            "set_cover_position",
+            {"entity_id": entity_id, "position": 100},
+            blocking=True,
+        )
+        # Still in its startup latency locally, but the door is already halfway.
+        get_devices.return_value = [
+            {"device_list": [{"device_id": "d1", "position": 50}]}
+        ]
+        with patch.object(
+            SmartSlydrCover,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=SmartSlydrCover.async_write_ha_state,
+        ) as write:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        assert write.call_count == 1
+        assert hass.states.get(entity_id).attributes["current_position"] == 50
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_command_failure_reads_back_before_retrying(
+    hass: HomeAssistant,
+) -> None:
+    """A timed-out command is retried only if the read-back shows it didn't apply."""
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_status = AsyncMock(return_value=[])
+    set_command = AsyncMock(return_value=[])
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=get_status,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.set_command",
+        new=set_command,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        move = [{"key": "position", "value": 100}]
+
+        def _applied(data):
+            return data.devices["d1"].position > 0
+
+        # Door still at 0: the command didn't take, send it once more.
+        set_command.side_effect = [asyncio.TimeoutError(), []]
+        get_status.return_value = [{"device_id": "d1", "position": 0}]
+        await coordinator.async_send_command("d1", move, "position", _applied)
+        assert set_command.await_count == 2
+
+        # Door already moving: the command took, no second send.
+        set_command.reset_mock()
+        set_command.side_effect = [asyncio.TimeoutError()]
+        get_status.return_value = [{"device_id": "d1", "position": 20}]
+        await coordinator.async_send_command("d1", move, "position", _applied)
+        assert set_command.await_count == 1
+
+        # Read-back has no entry for the door: the snapshot still says
+        # 20 from before, which proves nothing. Don't guess.
+        set_command.reset_mock()
+        set_command.side_effect = [asyncio.TimeoutError()]
+        get_status.return_value = [{"device_id": "d2", "position": 0}]
+        with pytest.raises(asyncio.TimeoutError):
+            await coordinator.async_send_command("d1", move, "position", _applied)
+        assert set_command.await_count == 1
+
+        # Read-back fails: don't guess, surface the original error.
+        set_command.reset_mock()
+        set_command.side_effect = [asyncio.TimeoutError()]
+        get_status.side_effect = aiohttp.ClientError()
+        with pytest.raises(asyncio.TimeoutError):
+            await coordinator.async_send_command("d1", move, "position", _applied)
+        assert set_command.await_count == 1
+
+        # A rejected command is definitive: no read, no retry.
+        set_command.reset_mock()
+        get_status.reset_mock()
+        set_command.side_effect = [SmartSlydrAuthError("rejected")]
+        with pytest.raises(SmartSlydrAuthError):
+            await coordinator.async_send_command("d1", move, "position", _applied)
+        get_status.assert_not_called()
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_poll_yields_once_to_a_pending_command(hass: HomeAssistant) -> None:
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_devices = AsyncMock(return_value=rooms)
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.commands_pending",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        assert get_devices.await_count == 1
+
+        # Skipped once without republishing anything...
+        with patch(
+            "homeassistant.helpers.entity.Entity.async_write_ha_state"
+        ) as write:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        assert write.call_count == 0
+        assert get_devices.await_count == 1
+        assert coordinator.last_update_success
+
+        # ...then deferred by seconds rather than a whole scan interval,
+        # and that poll goes ahead regardless.
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=_POLL_DEFER_S)
+        )
+        await hass.async_block_till_done()
+        assert get_devices.await_count == 2
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_backs_off_on_throttling_and_recovers(
+    hass: HomeAssistant,
+) -> None:
+    entry = _entry(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+    get_devices = AsyncMock(return_value=rooms)
+
+    def _http_error(status: int) -> aiohttp.ClientResponseError:
+        url = URL("https://test.example/devices")
+        return aiohttp.ClientResponseError(
+            aiohttp.RequestInfo(url, "GET", {}, url), (), status=status
+        )
+
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=get_devices,
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        configured = timedelta(seconds=60)
+        coordinator.async_set_update_interval(configured)
+
+        get_devices.side_effect = _http_error(429)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == configured * 2
+        get_devices.side_effect = _http_error(503)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == configured * 4
+        assert coordinator.polling_state()["reason"] == "http_503"
+        for _ in range(5):
+            await coordinator.async_refresh()
+        assert coordinator.update_interval == MAX_POLL_INTERVAL
+
+        # A plain 4xx isn't overload; the interval stays put.
+        get_devices.side_effect = _http_error(404)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == MAX_POLL_INTERVAL
+
+        # Clean polls step back down, one RECOVERY_STEP at a time.
+        get_devices.side_effect = None
+        await coordinator.async_refresh()
+        assert coordinator.polling_state()["reason"] == "recovering"
+        assert coordinator.update_interval == MAX_POLL_INTERVAL - RECOVERY_STEP
+        while coordinator.polling_state()["reason"] is not None:
+            await coordinator.async_refresh()
+        assert coordinator.update_interval == configured
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_token_rejected_after_renewal_starts_reauth(hass: HomeAssistant) -> None:
+    """A 401 on the renewed token too is an auth failure, not an outage."""
+    entry = _entry(hass)
+    base = DEFAULT_BASE_URL.rstrip("/")
+    with aioresponses() as m:
+        m.post(f"{base}/auth", payload={"access_token": "a1"})
+        m.get(f"{base}/devices", payload={"room_lists": []})
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        configured = coordinator.update_interval
+
+        m.post(f"{base}/auth", payload={"access_token": "a2"})
+        m.get(f"{base}/devices", status=401, reason="Unauthorized", payload={}, repeat=True)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert not coordinator.last_update_success
+    assert any(
+        flow["context"]["source"] == SOURCE_REAUTH
+        for flow in hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    )
+    assert ir.async_get(hass).async_get_issue(DOMAIN, ISSUE_UPSTREAM_UNAVAILABLE) is None
+    assert coordinator.update_interval == configured
+    await hass.config_entries.async_unload(entry.entry_id)
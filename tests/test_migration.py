@@ -1,4 +1,4 @@
-"""Migration tests for v1 -> v2 entry schema."""
+"""Migration tests for the entry schema and stored calibration."""
 
 from __future__ import annotations
 
@@ -9,7 +9,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.smartslydr.const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from custom_components.smartslydr.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DOMAIN,
+    SERVICE_RECALIBRATE_COVER,
+)
+from custom_components.smartslydr.storage import async_get_calibration_store
 
 
 @pytest.mark.asyncio
@@ -99,3 +105,51 @@ async def test_migrate_is_idempotent_for_already_v2_unique_id(
     assert survived is not None
     double = ent_reg.async_get_entity_id("cover", DOMAIN, "device-xyz_cover_cover")
     assert double is None
+
+
+@pytest.mark.asyncio
+async def test_calibration_moves_out_of_options_and_recalibrate_skips_reload(
+    hass: HomeAssistant,
+) -> None:
+    """Calibrated durations migrate to the store; clearing one doesn't reload."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        unique_id="user@example.com",
+        data={CONF_USERNAME: "user@example.com", CONF_PASSWORD: "pw"},
+        options={"calibrated_move_duration_d1": 14.5, "move_duration_d2": 9},
+    )
+    entry.add_to_hass(hass)
+    rooms = [{"device_list": [{"device_id": "d1", "position": 0}]}]
+
+    with patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_devices",
+        new=AsyncMock(return_value=rooms),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.get_status",
+        new=AsyncMock(return_value=[]),
+    ), patch(
+        "custom_components.smartslydr.SmartSlydrApiClient.authenticate",
+        new=AsyncMock(return_value=None),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        # The user override stays in options; the learned value moved.
+        assert dict(entry.options) == {"move_duration_d2": 9}
+        calibration = await async_get_calibration_store(hass)
+        assert calibration.duration("d1") == 14.5
+
+        entity_id = er.async_get(hass).async_get_entity_id("cover", DOMAIN, "d1_cover")
+        with patch.object(hass.config_entries, "async_reload") as reload:
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_RECALIBRATE_COVER,
+                {"entity_id": entity_id},
+                blocking=True,
+            )
+            await hass.async_block_till_done()
+
+        reload.assert_not_called()
+        assert calibration.duration("d1") is None
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,151 @@
+"""Tests for the shared cover motion scheduler."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.smartslydr.motion import (
+    MODEL_WINDOW,
+    TICK_INTERVAL,
+    SmartSlydrMotionModel,
+    async_get_motion_scheduler,
+)
+
+
+def _advance(hass: HomeAssistant, loop_time: list[float], seconds: float) -> None:
+    loop_time[0] += seconds
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=loop_time[0]))
+
+
+@pytest.mark.asyncio
+async def test_scheduler_ticks_many_moves_on_one_timer(hass: HomeAssistant) -> None:
+    """Every move shares one timer, reports only integer changes, then stops."""
+    scheduler = async_get_motion_scheduler(hass)
+    assert async_get_motion_scheduler(hass) is scheduler
+
+    loop_time = [hass.loop.time()]
+    positions: dict[str, list[int]] = {"a": [], "b": []}
+    done: dict[str, int | None] = {}
+
+    with patch.object(hass.loop, "time", side_effect=lambda: loop_time[0]), patch(
+        "custom_components.smartslydr.motion.async_track_time_interval",
+        wraps=async_track_time_interval,
+    ) as track:
+        for key, target in (("a", 100), ("b", 1)):
+            scheduler.async_start(
+                key,
+                0,
+                target,
+                2.0,
+                positions[key].append,
+                lambda pos, key=key: done.__setitem__(key, pos),
+            )
+        assert track.call_count == 1
+
+        for _ in range(int(2.0 / TICK_INTERVAL)):
+            _advance(hass, loop_time, TICK_INTERVAL)
+            await hass.async_block_till_done()
+
+    assert positions["a"] == [25, 50, 75]
+    # 0 -> 1 over 2s crosses one integer boundary; no redundant writes.
+    assert positions["b"] == [1]
+    assert done == {"a": 100, "b": 1}
+    assert scheduler._unsub is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancel_reports_none(hass: HomeAssistant) -> None:
+    scheduler = async_get_motion_scheduler(hass)
+    done: list[int | None] = []
+    scheduler.async_start("a", 0, 100, 10.0, lambda _pos: None, done.append)
+    assert scheduler.is_moving("a")
+    assert scheduler.async_cancel("a")
+    assert not scheduler.is_moving("a")
+    assert not scheduler.async_cancel("a")
+    assert done == [None]
+    assert scheduler._unsub is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_non_interpolated_move_only_completes(
+    hass: HomeAssistant,
+) -> None:
+    """interpolate=False tracks the timeline without publishing ticks."""
+    scheduler = async_get_motion_scheduler(hass)
+    loop_time = [hass.loop.time()]
+    positions: list[int] = []
+    done: list[int | None] = []
+
+    with patch.object(hass.loop, "time", side_effect=lambda: loop_time[0]):
+        scheduler.async_start(
+            "a", 0, 100, 2.0, positions.append, done.append, interpolate=False
+        )
+        _advance(hass, loop_time, 1.0)
+        await hass.async_block_till_done()
+        assert scheduler.estimate("a") == 50
+        assert done == []
+
+        _advance(hass, loop_time, 1.0)
+        await hass.async_block_till_done()
+
+    assert positions == []
+    assert done == [100]
+    assert scheduler.estimate("a") is None
+
+
+def test_motion_model_fits_latency_and_per_direction_speed() -> None:
+    """Partial moves in both directions recover latency and both paces."""
+    model = SmartSlydrMotionModel()
+    # 1.5s latency; opening at 0.2 s/pt, closing at 0.1 s/pt.
+    for distance in (10, 30, 60):
+        assert model.add_sample(distance, 1.5 + 0.2 * distance, True)
+        assert model.add_sample(distance, 1.5 + 0.1 * distance, False)
+
+    latency, travel = model.predict(50, True, full_duration=99.0)
+    assert latency == pytest.approx(1.5)
+    assert travel == pytest.approx(10.0)
+    latency, travel = model.predict(50, False, full_duration=99.0)
+    assert travel == pytest.approx(5.0)
+
+
+def test_motion_model_fallbacks() -> None:
+    model = SmartSlydrMotionModel()
+    # No samples: linear in the full-traversal duration, no latency.
+    assert model.predict(40, True, full_duration=20.0) == (0.0, 8.0)
+
+    # Noise is rejected.
+    assert not model.add_sample(2, 1.0, True)
+    assert not model.samples
+
+    # One distance can't separate latency from speed: pure rate, and the
+    # unseen direction borrows it.
+    model.add_sample(50, 10.0, True)
+    model.add_sample(50, 10.0, True)
+    assert model.predict(100, False, full_duration=99.0) == (0.0, pytest.approx(20.0))
+
+    for _ in range(MODEL_WINDOW):
+        model.add_sample(20, 2.0, False)
+    assert len(model.samples) == MODEL_WINDOW
+    assert all(not sample.opening for sample in model.samples)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_holds_position_during_latency(hass: HomeAssistant) -> None:
+    scheduler = async_get_motion_scheduler(hass)
+    loop_time = [hass.loop.time()]
+    with patch.object(hass.loop, "time", side_effect=lambda: loop_time[0]):
+        scheduler.async_start(
+            "a", 0, 100, 3.0, lambda _pos: None, lambda _pos: None, latency=1.0
+        )
+        loop_time[0] += 1.0
+        assert scheduler.estimate("a") == 0
+        loop_time[0] += 1.0
+        assert scheduler.estimate("a") == 50
+        scheduler.async_cancel("a")